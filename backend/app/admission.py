@@ -0,0 +1,202 @@
+import asyncio
+import math
+import os
+import time
+from collections import deque
+
+from starlette.responses import JSONResponse
+
+# Lanes in priority order: a freed slot always goes to the first non-empty
+# queue, so employee check-ins overtake dashboard reads under load.
+LANES = ("checkout", "dashboard")
+
+DASHBOARD_PREFIXES = ("/dept/", "/org/", "/participation")
+
+
+def lane_for(method, path):
+    """
+    Admission lane of a request, or None for requests that bypass the
+    controller (metrics, monitoring, roster updates).
+    """
+    if path.startswith(("/checkout", "/user/")):
+        return "checkout"
+    if method == "GET" and path.startswith(DASHBOARD_PREFIXES):
+        return "dashboard"
+    return None
+
+
+class Overloaded(Exception):
+    def __init__(self, reason, retry_after):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Bounded concurrency with prioritized, deadline-aware queueing.
+
+    At most `limit` requests run at once (the database pool size, so a
+    running request never waits for a connection). Beyond that requests
+    queue per lane, up to `max_queue` each. A request is turned away
+    immediately when its queue is full or when the expected wait (its
+    position over `limit`, times the average time a slot is held)
+    already exceeds its lane's deadline, and it is dropped from the
+    queue if the deadline passes while waiting. Shed requests get a
+    503 with a Retry-After hint instead of timing out downstream.
+    """
+
+    def __init__(self, limit, max_queue, deadlines, service_time=0.05):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.deadlines = deadlines
+        self.in_flight = 0
+        self.service_time = service_time  # EWMA of slot hold time, seconds
+        self._queues = {lane: deque() for lane in LANES}
+        self._stats = {
+            lane: {"admitted": 0, "queue_full": 0, "deadline": 0, "expired": 0, "max_wait_ms": 0.0}
+            for lane in LANES
+        }
+
+    @classmethod
+    def from_env(cls, limit):
+        return cls(
+            limit=limit,
+            max_queue=int(os.getenv("ADMISSION_MAX_QUEUE", str(limit * 5))),
+            deadlines={
+                "checkout": float(os.getenv("ADMISSION_CHECKOUT_DEADLINE_SECONDS", "2")),
+                "dashboard": float(os.getenv("ADMISSION_DASHBOARD_DEADLINE_SECONDS", "5")),
+            },
+        )
+
+    def _ahead_of(self, lane):
+        """Queued requests that will be admitted before a new one in `lane`."""
+        ahead = 0
+        for other in LANES:
+            ahead += len(self._queues[other])
+            if other == lane:
+                return ahead
+
+    def expected_wait(self, position):
+        return math.ceil(position / self.limit) * self.service_time
+
+    def _retry_after(self):
+        queued = sum(len(q) for q in self._queues.values())
+        return max(1, math.ceil(self.expected_wait(queued + 1)))
+
+    async def acquire(self, lane):
+        """
+        Wait for a slot; raises Overloaded when the request is shed.
+        """
+        stats = self._stats[lane]
+        queue = self._queues[lane]
+        if self.in_flight < self.limit and not any(self._queues.values()):
+            self.in_flight += 1
+            stats["admitted"] += 1
+            return
+
+        if len(queue) >= self.max_queue:
+            stats["queue_full"] += 1
+            raise Overloaded("queue_full", self._retry_after())
+        if self.expected_wait(self._ahead_of(lane) + 1) > self.deadlines[lane]:
+            stats["deadline"] += 1
+            raise Overloaded("deadline", self._retry_after())
+
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        queue.append(waiter)
+        timer = loop.call_later(self.deadlines[lane], self._expire, lane, waiter)
+        queued_at = time.monotonic()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # Client went away: give back a slot handed over meanwhile
+            if waiter.cancelled() or waiter.exception() is not None:
+                self._discard(queue, waiter)
+            else:
+                self.release()
+            raise
+        finally:
+            timer.cancel()
+        stats["admitted"] += 1
+        stats["max_wait_ms"] = max(stats["max_wait_ms"], (time.monotonic() - queued_at) * 1000)
+
+    def _expire(self, lane, waiter):
+        if waiter.done():
+            return
+        self._discard(self._queues[lane], waiter)
+        self._stats[lane]["expired"] += 1
+        waiter.set_exception(Overloaded("expired", self._retry_after()))
+
+    @staticmethod
+    def _discard(queue, waiter):
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            pass
+
+    def release(self, held=None):
+        if held is not None:
+            self.service_time += 0.1 * (held - self.service_time)
+        for lane in LANES:
+            queue = self._queues[lane]
+            while queue:
+                waiter = queue.popleft()
+                # A waiter cancelled by a client disconnect is done before
+                # its own cleanup gets to run; skip it
+                if not waiter.done():
+                    # The slot passes straight to the waiter; in_flight is unchanged
+                    waiter.set_result(None)
+                    return
+        self.in_flight -= 1
+
+    def metrics(self):
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "service_time_ms": self.service_time * 1000,
+            "lanes": {
+                lane: {
+                    "queued": len(self._queues[lane]),
+                    "deadline_seconds": self.deadlines[lane],
+                    "admitted": stats["admitted"],
+                    "shed": {
+                        "queue_full": stats["queue_full"],
+                        "deadline": stats["deadline"],
+                        "expired": stats["expired"],
+                    },
+                    "max_queue_wait_ms": stats["max_wait_ms"],
+                }
+                for lane, stats in self._stats.items()
+            },
+        }
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware that runs each request under AdmissionController,
+    holding its slot until the response has been sent.
+    """
+
+    def __init__(self, app, controller):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        lane = lane_for(scope.get("method"), scope["path"]) if scope["type"] == "http" else None
+        if lane is None:
+            return await self.app(scope, receive, send)
+        try:
+            await self.controller.acquire(lane)
+        except Overloaded as exc:
+            response = JSONResponse(
+                {"detail": "Server busy, retry later", "reason": exc.reason},
+                status_code=503,
+                headers={"Retry-After": str(exc.retry_after)},
+            )
+            return await response(scope, receive, send)
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(time.monotonic() - started)
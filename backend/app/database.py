@@ -1,8 +1,70 @@
 import os
+import time
+import threading
 import psycopg2
-import pandas as pd
 import hashlib
-from datetime import datetime
+import json
+import zlib
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from psycopg2 import pool
+from psycopg2.extras import execute_values
+from app.sketches import HyperLogLog, QuantileSketch
+from ml.rolling import ROLLING_FEATURES, RollingState
+
+# Per-(date, department) quantile sketches: sketch column -> checkout field
+SKETCHED_FIELDS = {
+    "stress_sketch": "self_reported_stress",
+    "sleep_sketch": "sleep_hours",
+    "score_sketch": "burnout_score",
+}
+
+# Seconds the replica is behind the primary; 0 when it has replayed
+# everything it received or is not a standby at all (e.g. a local copy).
+# NULL for a standby with no WAL receiver running: having replayed
+# everything received says nothing once the primary is out of reach.
+# Roles without pg_read_all_stats see only pid in pg_stat_wal_receiver
+# (status is NULL), so status is only checked when it is visible.
+REPLICA_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN NOT EXISTS (
+        SELECT 1 FROM pg_stat_wal_receiver
+        WHERE pid IS NOT NULL AND COALESCE(status, 'streaming') = 'streaming'
+    ) THEN NULL
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+# pg_advisory_xact_lock key serializing schema setup across workers
+# starting at once, and against the reflection_text migration
+SCHEMA_LOCK = 0x6275726E6F7574  # "burnout"
+
+# Drift buckets older than this are pruned
+DRIFT_RETENTION_HOURS = 24 * 7
+
+class PoolTimeout(Exception):
+    """No pooled connection became free within DB_POOL_TIMEOUT_SECONDS."""
+
+# Errors after which a read is retried on the primary
+REPLICA_ERRORS = (psycopg2.OperationalError, psycopg2.InterfaceError, pool.PoolError, PoolTimeout)
+
+def fetch_records(conn, query, params):
+    """
+    Rows as a list of dicts keyed by column name (NUMERIC as float).
+    """
+    cur = conn.cursor()
+    cur.execute(query, params)
+    columns = [col.name for col in cur.description]
+    return [
+        {c: float(v) if isinstance(v, Decimal) else v for c, v in zip(columns, row)}
+        for row in cur.fetchall()
+    ]
+
+def compress_text(text):
+    return psycopg2.Binary(zlib.compress(text.encode("utf-8"), 6))
 
 class BurnoutDatabase:
     def __init__(self):
@@ -10,12 +72,178 @@ class BurnoutDatabase:
         if not self.conn_url:
             raise RuntimeError("DATABASE_URL not set")
 
+        # Optional read-only target for dashboard queries
+        self.replica_url = os.getenv("DATABASE_REPLICA_URL")
+        self.pool_min = int(os.getenv("DB_POOL_MIN", "1"))
+        self.pool_max = int(os.getenv("DB_POOL_MAX", "10"))
+        self.pool_timeout = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "5"))
+        self.replica_connect_timeout = int(os.getenv("REPLICA_CONNECT_TIMEOUT_SECONDS", "3"))
+        self.replica_max_lag = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "30"))
+        self.replica_check_interval = float(os.getenv("REPLICA_CHECK_INTERVAL_SECONDS", "5"))
+        self.sketch_shards = int(os.getenv("SKETCH_SHARDS", "16"))
+
+        self._pools = {}
+        self._slots = {}
+        self._pool_lock = threading.Lock()
+        self._replica_healthy = False
+        self._replica_checked_until = 0.0
+
     def get_connection(self):
         return psycopg2.connect(self.conn_url)
 
+    def _pool(self, target):
+        """
+        Connection pool for "primary" or "replica", created on first use,
+        with a semaphore holding one slot per connection it may open.
+        A replica that stops answering fails fast on connect instead of
+        tying up the request for the OS TCP timeout.
+        """
+        if target not in self._pools:
+            with self._pool_lock:
+                if target not in self._pools:
+                    if target == "primary":
+                        url, kwargs = self.conn_url, {}
+                    else:
+                        url, kwargs = self.replica_url, {"connect_timeout": self.replica_connect_timeout}
+                    self._slots[target] = threading.BoundedSemaphore(self.pool_max)
+                    self._pools[target] = pool.ThreadedConnectionPool(
+                        self.pool_min, self.pool_max, url, **kwargs
+                    )
+        return self._pools[target]
+
+    @contextmanager
+    def _pooled(self, target):
+        """
+        Borrow a connection, waiting up to DB_POOL_TIMEOUT_SECONDS for one
+        to be returned when all DB_POOL_MAX are in use (getconn itself
+        raises PoolError rather than waiting).
+        """
+        pg_pool = self._pool(target)
+        slots = self._slots[target]
+        if not slots.acquire(timeout=self.pool_timeout):
+            raise PoolTimeout(f"no {target} connection free after {self.pool_timeout}s")
+        try:
+            conn = pg_pool.getconn()
+        except Exception:
+            slots.release()
+            raise
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            if not conn.closed:
+                conn.rollback()
+            raise
+        finally:
+            pg_pool.putconn(conn, close=bool(conn.closed))
+            slots.release()
+
+    def connection(self):
+        """
+        Pooled primary connection; commits on success, rolls back on error.
+        """
+        return self._pooled("primary")
+
+    def _replica_usable(self):
+        """
+        Whether reads may go to the replica: it is configured, reachable and
+        no more than REPLICA_MAX_LAG_SECONDS behind. Checked at most once
+        per REPLICA_CHECK_INTERVAL_SECONDS.
+        """
+        if not self.replica_url:
+            return False
+        now = time.monotonic()
+        if now < self._replica_checked_until:
+            return self._replica_healthy
+        try:
+            with self._pooled("replica") as conn:
+                cur = conn.cursor()
+                cur.execute(REPLICA_LAG_SQL)
+                lag = cur.fetchone()[0]
+            healthy = lag is not None and float(lag) <= self.replica_max_lag
+        except REPLICA_ERRORS:
+            healthy = False
+        self._replica_healthy = healthy
+        self._replica_checked_until = now + self.replica_check_interval
+        return healthy
+
+    def _read(self, query):
+        """
+        Run query(conn) on the replica when usable, otherwise (or if the
+        replica fails mid-query) on the primary.
+        """
+        if self._replica_usable():
+            try:
+                with self._pooled("replica") as conn:
+                    return query(conn)
+            except REPLICA_ERRORS:
+                self._replica_healthy = False
+                self._replica_checked_until = time.monotonic() + self.replica_check_interval
+        with self.connection() as conn:
+            return query(conn)
+
     def setup_database(self):
+        with self.connection() as conn:
+            self._create_schema(conn.cursor())
+
+    def migrate_reflections(self):
+        """
+        One-off move of reflection_text, on tables created before
+        checkout_reflections existed, into the side table (compressed),
+        then drop the column and rewrite the table to shed it. Not part
+        of startup: VACUUM FULL holds an ACCESS EXCLUSIVE lock on
+        individual_checkouts for the whole rewrite, so run it (python -m
+        app.migrate) in a maintenance window. The API works on either
+        layout meanwhile. Returns the number of reflections moved, or
+        None when there was nothing to migrate.
+        """
+        with self.connection() as conn:
+            cur = conn.cursor()
+            # Not concurrently with schema setup or another migration
+            cur.execute("SELECT pg_advisory_xact_lock(%s)", (SCHEMA_LOCK,))
+            cur.execute("""
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = current_schema()
+              AND table_name = 'individual_checkouts' AND column_name = 'reflection_text'
+            """)
+            if cur.fetchone() is None:
+                return None
+
+            moved = 0
+            source = conn.cursor(name="reflection_migration")
+            source.execute("""
+            SELECT id, reflection_text FROM individual_checkouts
+            WHERE reflection_text <> ''
+            """)
+            while True:
+                batch = source.fetchmany(5000)
+                if not batch:
+                    break
+                execute_values(cur, """
+                INSERT INTO checkout_reflections (checkout_id, body) VALUES %s
+                ON CONFLICT (checkout_id) DO NOTHING
+                """, [(checkout_id, compress_text(text)) for checkout_id, text in batch], page_size=1000)
+                moved += len(batch)
+            source.close()
+            cur.execute("ALTER TABLE individual_checkouts DROP COLUMN reflection_text")
+
+        # DROP COLUMN only hides the data; rewrite the table to shed it,
+        # then rebuild the visibility map for index-only scans.
+        # VACUUM cannot run inside a transaction, hence autocommit.
         conn = self.get_connection()
-        cur = conn.cursor()
+        try:
+            conn.autocommit = True
+            cur = conn.cursor()
+            cur.execute("VACUUM FULL individual_checkouts")
+            cur.execute("VACUUM ANALYZE individual_checkouts")
+        finally:
+            conn.close()
+        return moved
+
+    def _create_schema(self, cur):
+        # Concurrent CREATE ... IF NOT EXISTS can still collide; one worker
+        # at a time, until this transaction commits
+        cur.execute("SELECT pg_advisory_xact_lock(%s)", (SCHEMA_LOCK,))
 
         cur.execute("""
         CREATE TABLE IF NOT EXISTS individual_checkouts (
@@ -35,11 +263,31 @@ class BurnoutDatabase:
             sentiment_score REAL,
             burnout_score INTEGER,
             risk_label TEXT,
-            reflection_text TEXT,
             UNIQUE(user_id_hash, date)
         );
         """)
 
+        # Free-text reflections live apart from the numeric columns, so
+        # scans over check-ins stay narrow. Bodies are zlib-compressed
+        # already; EXTERNAL keeps Postgres from compressing them again.
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS checkout_reflections (
+            checkout_id INTEGER PRIMARY KEY
+                REFERENCES individual_checkouts(id) ON DELETE CASCADE,
+            body BYTEA NOT NULL
+        );
+        ALTER TABLE checkout_reflections ALTER COLUMN body SET STORAGE EXTERNAL;
+        """)
+
+        # Covering index for /user/history: pages are served by an
+        # index-only scan.
+        cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_checkouts_user_history
+        ON individual_checkouts (user_id_hash, date DESC)
+        INCLUDE (self_reported_stress, sleep_hours, study_hours,
+                 burnout_score, risk_label);
+        """)
+
         cur.execute("""
         CREATE TABLE IF NOT EXISTS department_aggregates (
             id SERIAL PRIMARY KEY,
@@ -77,15 +325,56 @@ class BurnoutDatabase:
         );
         """)
 
-        conn.commit()
-        conn.close()
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS department_sketches (
+            id SERIAL PRIMARY KEY,
+            date DATE NOT NULL,
+            department TEXT NOT NULL,
+            stress_sketch TEXT,
+            sleep_sketch TEXT,
+            score_sketch TEXT,
+            participants_hll BYTEA,
+            shard SMALLINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(date, department, shard)
+        );
+        """)
+
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS department_rosters (
+            department TEXT PRIMARY KEY,
+            headcount INTEGER NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        """)
+
+        # Per-user ring buffer of the last 30 days (ml/rolling.py)
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS user_rolling_features (
+            user_id_hash TEXT PRIMARY KEY,
+            state TEXT NOT NULL,
+            updated_at TIMESTAMP NOT NULL
+        );
+        """)
+
+        # Per-worker drift histograms, one row per (worker, time bucket)
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS drift_buckets (
+            worker_id TEXT NOT NULL,
+            bucket_start TIMESTAMP NOT NULL,
+            updated_at TIMESTAMP NOT NULL,
+            counts TEXT NOT NULL,
+            PRIMARY KEY (worker_id, bucket_start)
+        );
+        """)
 
     def hash_user(self, email: str) -> str:
         return hashlib.sha256(email.encode()).hexdigest()
 
-    def save_checkout(self, email, dept, data, score, label, reflection=""):
-        conn = self.get_connection()
-        cur = conn.cursor()
+    def _insert_checkout(self, cur, email, dept, data, score, label, reflection):
+        user = self.hash_user(email)
+        now = datetime.now()
+        today = now.date()
 
         cur.execute("""
         INSERT INTO individual_checkouts (
@@ -94,15 +383,14 @@ class BurnoutDatabase:
             engagement_level, assignment_deadline_missed,
             assignments_pending, upcoming_deadline_load,
             self_reported_stress, sentiment_score,
-            burnout_score, risk_label, reflection_text
-        ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-        ON CONFLICT (user_id_hash, date) DO UPDATE SET
-            burnout_score = EXCLUDED.burnout_score,
-            risk_label = EXCLUDED.risk_label;
+            burnout_score, risk_label
+        ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+        ON CONFLICT (user_id_hash, date) DO NOTHING
+        RETURNING id;
         """, (
-            self.hash_user(email),
-            datetime.now(),
-            datetime.now().date(),
+            user,
+            now,
+            today,
             dept,
             data["study_hours"],
             data["sleep_hours"],
@@ -114,27 +402,443 @@ class BurnoutDatabase:
             data["self_reported_stress"],
             data["sentiment_score"],
             score,
-            label,
-            reflection
+            label
         ))
+        inserted = cur.fetchone()
+        if inserted:
+            checkout_id = inserted[0]
+        else:
+            # A re-submission only re-scores the day's row. The conflict
+            # waited for any racing first submission to commit, so the
+            # locked row holds the score that has to come back out of the
+            # department sketch.
+            cur.execute("""
+            SELECT id, department, burnout_score FROM individual_checkouts
+            WHERE user_id_hash = %s AND date = %s
+            FOR UPDATE
+            """, (user, today))
+            checkout_id, prev_dept, prev_score = cur.fetchone()
+            cur.execute("""
+            UPDATE individual_checkouts SET burnout_score = %s, risk_label = %s
+            WHERE id = %s
+            """, (score, label, checkout_id))
+
+        # Like the inputs, a re-submission keeps the day's first reflection
+        if reflection:
+            cur.execute("""
+            INSERT INTO checkout_reflections (checkout_id, body) VALUES (%s, %s)
+            ON CONFLICT (checkout_id) DO NOTHING;
+            """, (checkout_id, compress_text(reflection)))
+
+        if inserted:
+            self._update_sketches(cur, today, dept, user, {
+                "stress_sketch": [(data["self_reported_stress"], 1)],
+                "sleep_sketch": [(data["sleep_hours"], 1)],
+                "score_sketch": [(score, 1)],
+            })
+            self._update_rolling(cur, user, today, data)
+        else:
+            self._update_sketches(cur, today, prev_dept, user, {
+                "score_sketch": [(prev_score, -1), (score, 1)],
+            })
+
+    def _update_rolling(self, cur, user, day, data):
+        """
+        Record the check-in in the user's rolling-window state: one
+        primary-key read and one upsert, whatever the history length.
+        """
+        cur.execute("""
+        SELECT state FROM user_rolling_features
+        WHERE user_id_hash = %s
+        FOR UPDATE
+        """, (user,))
+        stored = cur.fetchone()
+        state = RollingState.from_json(stored[0] if stored else None)
+        state.add(day, data)
+        cur.execute("""
+        INSERT INTO user_rolling_features (user_id_hash, state, updated_at)
+        VALUES (%s, %s, %s)
+        ON CONFLICT (user_id_hash) DO UPDATE SET
+            state = EXCLUDED.state,
+            updated_at = EXCLUDED.updated_at;
+        """, (user, state.to_json(), datetime.now()))
+
+    def rolling_features(self, email, day=None):
+        """
+        The user's ROLLING_FEATURES as of `day` (default today), or None
+        if they have never checked in.
+        """
+        with self.connection() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+            SELECT state FROM user_rolling_features WHERE user_id_hash = %s
+            """, (self.hash_user(email),))
+            stored = cur.fetchone()
+        if stored is None:
+            return None
+        values = RollingState.from_json(stored[0]).features(day or date.today())
+        return dict(zip(ROLLING_FEATURES, values))
+
+    def _update_sketches(self, cur, day, dept, user, changes):
+        """
+        Apply weighted value changes to the user's (day, dept) sketch shard
+        and add the user to its participant sketch, inside the caller's
+        transaction. Each (day, dept) is split over SKETCH_SHARDS rows by
+        user hash so concurrent check-ins rarely wait on the same row
+        lock; readers merge the shards.
+        """
+        shard = int(user[-8:], 16) % self.sketch_shards
+        cur.execute("""
+        INSERT INTO department_sketches (date, department, shard)
+        VALUES (%s, %s, %s)
+        ON CONFLICT (date, department, shard) DO NOTHING;
+        """, (day, dept, shard))
+        columns = ", ".join(changes)
+        cur.execute(f"""
+        SELECT participants_hll, {columns} FROM department_sketches
+        WHERE date = %s AND department = %s AND shard = %s
+        FOR UPDATE
+        """, (day, dept, shard))
+        stored_hll, *stored = cur.fetchone()
+
+        updated = []
+        for column, text in zip(changes, stored):
+            sketch = QuantileSketch.from_json(text)
+            for value, weight in changes[column]:
+                sketch.add(value, weight)
+            updated.append(sketch.to_json())
+
+        participants = HyperLogLog.from_bytes(stored_hll)
+        participants.add(user)
+
+        assignments = ", ".join(f"{column} = %s" for column in changes)
+        cur.execute(f"""
+        UPDATE department_sketches
+        SET {assignments}, participants_hll = %s, updated_at = %s
+        WHERE date = %s AND department = %s AND shard = %s
+        """, (*updated, psycopg2.Binary(participants.to_bytes()), datetime.now(), day, dept, shard))
+
+
+    def save_checkout(self, email, dept, data, score, label, reflection=""):
+        with self.connection() as conn:
+            self._insert_checkout(conn.cursor(), email, dept, data, score, label, reflection)
+
+    def save_checkouts(self, checkouts):
+        """
+        Batch variant of save_checkout: one connection and one transaction
+        for a list of (email, dept, data, score, label, reflection) tuples.
+        """
+        with self.connection() as conn:
+            cur = conn.cursor()
+            for checkout in checkouts:
+                self._insert_checkout(cur, *checkout)
+
+    def user_history(self, email, before=None, limit=30):
+        """
+        One page of a user's check-ins, newest first, with 7/30-day
+        rolling trends. Keyset pagination: pass the returned cursor as
+        `before` to fetch the next (older) page.
+        """
+        user = self.hash_user(email)
+        page_filter = "AND date < %s" if before else ""
+        page_params = (user, before, limit) if before else (user, limit)
+
+        # Served from the primary: employees expect to see the check-in
+        # they just submitted
+        with self.connection() as conn:
+            rows = fetch_records(conn, f"""
+            WITH page AS (
+                SELECT date FROM individual_checkouts
+                WHERE user_id_hash = %s {page_filter}
+                ORDER BY date DESC
+                LIMIT %s
+            ),
+            bounds AS (
+                SELECT MIN(date) AS lo, MAX(date) AS hi FROM page
+            ),
+            windowed AS (
+                SELECT
+                    c.date, c.self_reported_stress, c.sleep_hours,
+                    c.study_hours, c.burnout_score, c.risk_label,
+                    AVG(c.self_reported_stress) OVER w7 AS stress_7d,
+                    AVG(c.self_reported_stress) OVER w30 AS stress_30d,
+                    AVG(c.sleep_hours) OVER w7 AS sleep_7d,
+                    AVG(c.sleep_hours) OVER w30 AS sleep_30d,
+                    AVG(c.burnout_score) OVER w7 AS score_7d,
+                    AVG(c.burnout_score) OVER w30 AS score_30d
+                FROM individual_checkouts c, bounds b
+                WHERE c.user_id_hash = %s
+                  AND c.date BETWEEN b.lo - 29 AND b.hi
+                WINDOW
+                    w7 AS (ORDER BY c.date RANGE BETWEEN INTERVAL '6 days' PRECEDING AND CURRENT ROW),
+                    w30 AS (ORDER BY c.date RANGE BETWEEN INTERVAL '29 days' PRECEDING AND CURRENT ROW)
+            )
+            SELECT w.* FROM windowed w, bounds b
+            WHERE w.date >= b.lo
+            ORDER BY w.date DESC
+            """, page_params + (user,))
+
+        next_before = rows[-1]["date"] if len(rows) == limit else None
+        return rows, next_before
+
+    def save_drift_snapshot(self, worker_id, bucket_start, counts):
+        """
+        Store a worker's counts for one bucket and prune buckets older
+        than DRIFT_RETENTION_HOURS, including those of exited workers.
+        """
+        now = datetime.now()
+        with self.connection() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+            INSERT INTO drift_buckets (worker_id, bucket_start, updated_at, counts)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (worker_id, bucket_start) DO UPDATE SET
+                updated_at = EXCLUDED.updated_at,
+                counts = EXCLUDED.counts;
+            """, (worker_id, bucket_start, now, json.dumps(counts)))
+            cur.execute("""
+            DELETE FROM drift_buckets WHERE bucket_start < %s
+            """, (now - timedelta(hours=DRIFT_RETENTION_HOURS),))
 
-        conn.commit()
-        conn.close()
+    def drift_snapshots(self, since, bucket_seconds):
+        """
+        Histogram counts of every worker's buckets that overlap [since, now].
+        """
+        def query(conn):
+            cur = conn.cursor()
+            cur.execute("""
+            SELECT counts FROM drift_buckets WHERE bucket_start > %s
+            """, (since - timedelta(seconds=bucket_seconds),))
+            return cur.fetchall()
+
+        return [json.loads(counts) for (counts,) in self._read(query)]
+
+    def _daily_participation(self, cur, start, end, departments=None):
+        """
+        Daily participation rates from the HyperLogLog sketches and the
+        rosters, computed at read time so check-ins never contend on
+        aggregate rows: ({(date, department): rate}, {date: org_rate}).
+        Departments without a roster headcount have no rate and are left
+        out of the organization rate.
+        """
+        cur.execute("""
+        SELECT s.date, s.department, s.participants_hll, r.headcount
+        FROM department_sketches s
+        JOIN department_rosters r ON r.department = s.department
+        WHERE s.date BETWEEN %s AND %s
+          AND s.participants_hll IS NOT NULL
+          AND (%s::text[] IS NULL OR s.department = ANY(%s::text[]))
+        """, (start, end, departments, departments))
+        sketches, headcounts = {}, {}
+        for day, dept, registers, headcount in cur.fetchall():
+            sketches.setdefault((day, dept), HyperLogLog()).merge(HyperLogLog.from_bytes(registers))
+            headcounts[dept] = headcount
+
+        per_dept, org, rostered = {}, {}, {}
+        for (day, dept), sketch in sketches.items():
+            per_dept[(day, dept)] = min(1.0, sketch.estimate() / headcounts[dept])
+            org.setdefault(day, HyperLogLog()).merge(sketch)
+            rostered[day] = rostered.get(day, 0) + headcounts[dept]
+        org_rates = {
+            day: min(1.0, sketch.estimate() / rostered[day]) for day, sketch in org.items()
+        }
+        return per_dept, org_rates
 
     def department_aggregates(self, start, end):
-        conn = self.get_connection()
-        df = pd.read_sql("""
-        SELECT * FROM department_aggregates
-        WHERE date BETWEEN %s AND %s
-        """, conn, params=(start, end))
-        conn.close()
-        return df
+        def query(conn):
+            rows = fetch_records(conn, """
+            SELECT * FROM department_aggregates
+            WHERE date BETWEEN %s AND %s
+            """, (start, end))
+            rates, _ = self._daily_participation(conn.cursor(), start, end)
+            for row in rows:
+                row["participation_rate"] = rates.get(
+                    (row["date"], row["department"]), row["participation_rate"]
+                )
+            return rows
+
+        return self._read(query)
+
+    def org_summary(self, start, end, departments=None):
+        """
+        Dashboard KPIs over the last 7 days of the range, weighted by
+        total_checkouts so large departments count proportionally.
+        """
+        def query(conn):
+            cur = conn.cursor()
+            cur.execute("""
+            WITH scoped AS (
+                SELECT * FROM department_aggregates
+                WHERE date BETWEEN %s AND %s
+                  AND (%s::text[] IS NULL OR department = ANY(%s::text[]))
+            ),
+            recent AS (
+                SELECT * FROM scoped
+                WHERE date >= (SELECT MAX(date) FROM scoped) - 7
+            )
+            SELECT
+                SUM(avg_stress * total_checkouts)
+                    / NULLIF(SUM(total_checkouts) FILTER (WHERE avg_stress IS NOT NULL), 0),
+                SUM(avg_sleep * total_checkouts)
+                    / NULLIF(SUM(total_checkouts) FILTER (WHERE avg_sleep IS NOT NULL), 0),
+                SUM(risk_high_count)::REAL
+                    / NULLIF(SUM(risk_low_count + risk_medium_count + risk_high_count), 0),
+                COALESCE(SUM(total_checkouts), 0),
+                MIN(date),
+                MAX(date)
+            FROM recent
+            """, (start, end, departments, departments))
+            row = cur.fetchone()
+            window_start, window_end = row[-2:]
+            if window_start is None:
+                return (None, *row)
+
+            # Participation comes from the sketches, weighted like the rest
+            cur.execute("""
+            SELECT date, department, total_checkouts, participation_rate
+            FROM department_aggregates
+            WHERE date BETWEEN %s AND %s
+              AND (%s::text[] IS NULL OR department = ANY(%s::text[]))
+            """, (window_start, window_end, departments, departments))
+            recent = cur.fetchall()
+            rates, _ = self._daily_participation(cur, window_start, window_end, departments)
+            weighted = [
+                (rates.get((day, dept), stored), checkouts)
+                for day, dept, checkouts, stored in recent
+            ]
+            weighted = [(rate, n) for rate, n in weighted if rate is not None and n]
+            total = sum(n for _, n in weighted)
+            participation = sum(rate * n for rate, n in weighted) / total if total else None
+            return (participation, *row)
+
+        row = self._read(query)
+
+        keys = (
+            "participation_rate", "avg_stress", "avg_sleep",
+            "high_risk_pct", "total_checkouts", "window_start", "window_end"
+        )
+        return dict(zip(keys, row))
+
+    def workload_sleep_bins(self, start, end, bins=20, departments=None):
+        """
+        2D histogram of avg_workload vs avg_sleep over department rows.
+        Each non-empty bin carries its center, checkout weight and
+        checkout-weighted stress, so the result size is bounded by bins².
+        """
+        return self._read(lambda conn: fetch_records(conn, """
+        WITH scoped AS (
+            SELECT avg_workload, avg_sleep, avg_stress, total_checkouts
+            FROM department_aggregates
+            WHERE date BETWEEN %(start)s AND %(end)s
+              AND (%(depts)s::text[] IS NULL OR department = ANY(%(depts)s::text[]))
+              AND avg_workload IS NOT NULL AND avg_sleep IS NOT NULL
+        ),
+        bounds AS (
+            SELECT MIN(avg_workload) AS x_lo, MAX(avg_workload) AS x_hi,
+                   MIN(avg_sleep) AS y_lo, MAX(avg_sleep) AS y_hi
+            FROM scoped
+        ),
+        binned AS (
+            SELECT
+                CASE WHEN x_hi > x_lo
+                     THEN LEAST(width_bucket(avg_workload, x_lo, x_hi, %(bins)s), %(bins)s)
+                     ELSE 1 END AS x_bin,
+                CASE WHEN y_hi > y_lo
+                     THEN LEAST(width_bucket(avg_sleep, y_lo, y_hi, %(bins)s), %(bins)s)
+                     ELSE 1 END AS y_bin,
+                s.*, b.*
+            FROM scoped s, bounds b
+        )
+        SELECT
+            x_bin, y_bin,
+            MIN(x_lo) + (x_bin - 0.5) * GREATEST(MIN(x_hi) - MIN(x_lo), 0) / %(bins)s AS avg_workload,
+            MIN(y_lo) + (y_bin - 0.5) * GREATEST(MIN(y_hi) - MIN(y_lo), 0) / %(bins)s AS avg_sleep,
+            SUM(avg_stress * total_checkouts)
+                / NULLIF(SUM(total_checkouts) FILTER (WHERE avg_stress IS NOT NULL), 0) AS avg_stress,
+            COALESCE(SUM(total_checkouts), 0) AS total_checkouts,
+            COUNT(*) AS rows
+        FROM binned
+        GROUP BY x_bin, y_bin
+        ORDER BY x_bin, y_bin
+        """, {"start": start, "end": end, "bins": bins, "depts": departments}))
+
+    def department_sketches(self, start, end, departments=None):
+        """
+        Stored sketches per department over the range, merged per
+        department: {department: {field: QuantileSketch}}.
+        """
+        def query(conn):
+            cur = conn.cursor()
+            cur.execute(f"""
+            SELECT department, {", ".join(SKETCHED_FIELDS)}
+            FROM department_sketches
+            WHERE date BETWEEN %s AND %s
+              AND (%s::text[] IS NULL OR department = ANY(%s::text[]))
+            """, (start, end, departments, departments))
+            return cur.fetchall()
+
+        rows = self._read(query)
+
+        merged = {}
+        for dept, *texts in rows:
+            sketches = merged.setdefault(
+                dept, {field: QuantileSketch() for field in SKETCHED_FIELDS.values()}
+            )
+            for field, text in zip(SKETCHED_FIELDS.values(), texts):
+                if text:
+                    sketches[field].merge(QuantileSketch.from_json(text))
+        return merged
+
+    def set_headcount(self, dept, headcount):
+        with self.connection() as conn:
+            conn.cursor().execute("""
+            INSERT INTO department_rosters (department, headcount, updated_at)
+            VALUES (%s, %s, %s)
+            ON CONFLICT (department) DO UPDATE SET
+                headcount = EXCLUDED.headcount,
+                updated_at = EXCLUDED.updated_at;
+            """, (dept, headcount, datetime.now()))
+
+    def participation(self, start, end, departments=None):
+        """
+        Distinct participants over the range per department, against
+        roster headcount, plus two HyperLogLog unions of the daily
+        sketches: one over departments with a headcount (the base for the
+        overall rate) and one over departments without.
+        """
+        def query(conn):
+            cur = conn.cursor()
+            cur.execute("""
+            SELECT s.department, s.participants_hll, r.headcount
+            FROM department_sketches s
+            LEFT JOIN department_rosters r ON r.department = s.department
+            WHERE s.date BETWEEN %s AND %s
+              AND s.participants_hll IS NOT NULL
+              AND (%s::text[] IS NULL OR s.department = ANY(%s::text[]))
+            """, (start, end, departments, departments))
+            return cur.fetchall()
+
+        rows = self._read(query)
+
+        per_dept, headcounts = {}, {}
+        for dept, registers, headcount in rows:
+            per_dept.setdefault(dept, HyperLogLog()).merge(HyperLogLog.from_bytes(registers))
+            headcounts[dept] = headcount
+
+        rostered, unrostered = HyperLogLog(), HyperLogLog()
+        for dept, sketch in per_dept.items():
+            (rostered if headcounts[dept] else unrostered).merge(sketch)
+        return per_dept, headcounts, rostered, unrostered
 
     def org_aggregates(self, start, end):
-        conn = self.get_connection()
-        df = pd.read_sql("""
-        SELECT * FROM organization_aggregates
-        WHERE date BETWEEN %s AND %s
-        """, conn, params=(start, end))
-        conn.close()
-        return df
+        def query(conn):
+            rows = fetch_records(conn, """
+            SELECT * FROM organization_aggregates
+            WHERE date BETWEEN %s AND %s
+            """, (start, end))
+            _, rates = self._daily_participation(conn.cursor(), start, end)
+            for row in rows:
+                row["participation_rate"] = rates.get(row["date"], row["participation_rate"])
+            return rows
+
+        return self._read(query)
@@ -1,11 +1,26 @@
-from fastapi import FastAPI
+import os
+import socket
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+from fastapi import BackgroundTasks, FastAPI, Header, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import BurnoutDatabase
-from app.schemas import CheckoutRequest
-from ml.predict import predict_burnout
+from fastapi.responses import JSONResponse
+from app.admission import AdmissionController, AdmissionMiddleware
+from app.database import DRIFT_RETENTION_HOURS, BurnoutDatabase, PoolTimeout
+from app.schemas import CheckoutRequest, CheckoutResponse, RosterUpdate
+from app.sketches import QuantileSketch
+from ml.predict import artifacts, explain_burnout, explain_burnout_batch, feature_row
+from ml.utils import get_risk_recommendations
+from ml.drift import DriftMonitor
 
 app = FastAPI(title="Burnout AI")
 
+db = BurnoutDatabase()
+
+# One running request per pooled connection; the rest queue or are shed
+admission = AdmissionController.from_env(limit=db.pool_max)
+app.add_middleware(AdmissionMiddleware, controller=admission)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -13,15 +28,63 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-db = BurnoutDatabase()
+@app.exception_handler(PoolTimeout)
+def pool_timeout_handler(request, exc):
+    # Requests that bypass admission can still find the pool exhausted
+    return JSONResponse(
+        {"detail": "Server busy, retry later", "reason": "pool_timeout"},
+        status_code=503,
+        headers={"Retry-After": str(max(1, round(db.pool_timeout)))},
+    )
+
+TOP_FACTORS = 3
+
+# A batch runs in one transaction under one admission slot
+MAX_BATCH_SIZE = 100
+
+def checkout_response(data, score, label, factors, risk_factors):
+    return {
+        "score": score,
+        "label": label,
+        "top_factors": [{"feature": f, "contribution": c} for f, c in factors[:TOP_FACTORS]],
+        "recommendations": get_risk_recommendations(label, data, risk_factors),
+    }
+
+STRESS_ALERT_THRESHOLD = 7.5
+SLEEP_ALERT_THRESHOLD = 6.5
+
+# Live feature histograms; None when no reference was saved at training time
+drift_monitor = DriftMonitor.load()
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+DRIFT_FLUSH_EVERY = 100
+
+def publish_finished_drift_bucket():
+    finished = drift_monitor.rotate()
+    if finished:
+        db.save_drift_snapshot(WORKER_ID, *finished)
+
+def observe_drift(rows):
+    """
+    Runs after the response is sent: update this worker's histograms and
+    periodically publish them so /monitoring/drift sees every worker.
+    """
+    publish_finished_drift_bucket()
+    for row in rows:
+        drift_monitor.observe(row)
+    before = drift_monitor.observed - len(rows)
+    if drift_monitor.observed // DRIFT_FLUSH_EVERY > before // DRIFT_FLUSH_EVERY:
+        db.save_drift_snapshot(WORKER_ID, *drift_monitor.snapshot())
 
 @app.on_event("startup")
 def startup():
     db.setup_database()
+    # Model artifacts load on the first prediction unless pre-warmed here
+    if os.getenv("BURNOUT_PREWARM") == "1":
+        artifacts()
 
-@app.post("/checkout")
-def checkout(req: CheckoutRequest):
-    score, label = predict_burnout(req.dict())
+@app.post("/checkout", response_model=CheckoutResponse)
+def checkout(req: CheckoutRequest, background_tasks: BackgroundTasks):
+    score, label, factors, risk_factors = explain_burnout(req.dict())
     db.save_checkout(
         req.email,
         req.department,
@@ -30,12 +93,159 @@ def checkout(req: CheckoutRequest):
         label,
         req.reflection or ""
     )
-    return {"score": score, "label": label}
+    if drift_monitor:
+        background_tasks.add_task(observe_drift, [feature_row(req.dict())])
+    return checkout_response(req.dict(), score, label, factors, risk_factors)
+
+@app.post("/checkout/batch", response_model=List[CheckoutResponse])
+def checkout_batch(reqs: List[CheckoutRequest], background_tasks: BackgroundTasks):
+    if len(reqs) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_BATCH_SIZE} check-ins per batch")
+    rows = [req.dict() for req in reqs]
+    results = explain_burnout_batch(rows) if rows else []
+    db.save_checkouts([
+        (req.email, req.department, row, score, label, req.reflection or "")
+        for req, row, (score, label, _, _) in zip(reqs, rows, results)
+    ])
+    if drift_monitor and rows:
+        background_tasks.add_task(observe_drift, [feature_row(row) for row in rows])
+    return [
+        checkout_response(row, *result)
+        for row, result in zip(rows, results)
+    ]
+
+# Per-user reads take the email in a header, not the query string, so
+# it stays out of access and proxy logs
+@app.get("/user/history")
+def user_history(
+    email: str = Header(..., alias="X-User-Email"),
+    before: Optional[date] = None,
+    limit: int = Query(30, ge=1, le=180),
+):
+    rows, next_before = db.user_history(email, before, limit)
+    return {"items": rows, "next_before": next_before}
+
+@app.get("/user/rolling-features")
+def user_rolling_features(email: str = Header(..., alias="X-User-Email")):
+    features = db.rolling_features(email)
+    if features is None:
+        raise HTTPException(status_code=404, detail="No check-ins for this user")
+    return features
 
 @app.get("/dept/aggregates")
 def dept(start: str, end: str):
-    return db.department_aggregates(start, end).to_dict("records")
+    return db.department_aggregates(start, end)
+
+@app.get("/dept/workload-sleep-bins")
+def workload_sleep_bins(
+    start: str,
+    end: str,
+    bins: int = Query(20, ge=1, le=100),
+    departments: Optional[List[str]] = Query(None)
+):
+    return db.workload_sleep_bins(start, end, bins, departments)
+
+@app.get("/dept/quantiles")
+def dept_quantiles(
+    start: str,
+    end: str,
+    departments: Optional[List[str]] = Query(None),
+    q: List[float] = Query([0.5, 0.9])
+):
+    """
+    Quantiles of stress, sleep and burnout score per department and
+    across the selection, answered by merging the stored daily sketches.
+    """
+    per_dept = db.department_sketches(start, end, departments)
+    overall = {}
+    for sketches in per_dept.values():
+        for field, sketch in sketches.items():
+            overall.setdefault(field, QuantileSketch()).merge(sketch)
+
+    def summarize(sketches):
+        return {
+            field: {
+                "count": sketch.count,
+                **{f"p{p * 100:g}": sketch.quantile(p) for p in q}
+            }
+            for field, sketch in sketches.items()
+        }
+
+    return {
+        "departments": {dept: summarize(s) for dept, s in per_dept.items()},
+        "overall": summarize(overall),
+    }
+
+@app.put("/dept/roster")
+def dept_roster(update: RosterUpdate):
+    if update.headcount <= 0:
+        raise HTTPException(status_code=422, detail="headcount must be positive")
+    db.set_headcount(update.department, update.headcount)
+    return {"department": update.department, "headcount": update.headcount}
+
+@app.get("/participation")
+def participation(start: str, end: str, departments: Optional[List[str]] = Query(None)):
+    """
+    Share of rostered people who checked in at least once in the range.
+    The overall rate counts only departments with a roster headcount;
+    check-ins from the others are reported as unrostered_participants.
+    Estimates carry HyperLogLog's ~3.3% standard error.
+    """
+    per_dept, headcounts, rostered, unrostered = db.participation(start, end, departments)
+
+    def rate(estimate, headcount):
+        return min(1.0, estimate / headcount) if headcount else None
+
+    headcount = sum(h for h in headcounts.values() if h)
+    participants = rostered.estimate()
+    return {
+        "participants": participants,
+        "headcount": headcount or None,
+        "participation_rate": rate(participants, headcount),
+        "unrostered_participants": unrostered.estimate(),
+        "relative_error": rostered.relative_error,
+        "departments": {
+            dept: {
+                "participants": sketch.estimate(),
+                "headcount": headcounts[dept],
+                "participation_rate": rate(sketch.estimate(), headcounts[dept]),
+            }
+            for dept, sketch in per_dept.items()
+        },
+    }
 
 @app.get("/org/aggregates")
 def org(start: str, end: str):
-    return db.org_aggregates(start, end).to_dict("records")
+    return db.org_aggregates(start, end)
+
+@app.get("/org/summary")
+def org_summary(start: str, end: str, departments: Optional[List[str]] = Query(None)):
+    summary = db.org_summary(start, end, departments)
+    alerts = []
+    if summary["avg_stress"] is not None and summary["avg_stress"] > STRESS_ALERT_THRESHOLD:
+        alerts.append("elevated_stress")
+    if summary["avg_sleep"] is not None and summary["avg_sleep"] < SLEEP_ALERT_THRESHOLD:
+        alerts.append("sleep_deficit")
+    summary["alerts"] = alerts
+    return summary
+
+@app.get("/metrics/admission")
+def admission_metrics():
+    return admission.metrics()
+
+@app.get("/monitoring/drift")
+def drift(window_hours: int = Query(24, ge=1, le=DRIFT_RETENTION_HOURS)):
+    """
+    Drift over the check-ins of the last `window_hours`, across workers,
+    rounded out to whole buckets (hours).
+    """
+    if drift_monitor is None:
+        raise HTTPException(status_code=404, detail="No drift reference saved")
+    publish_finished_drift_bucket()
+    db.save_drift_snapshot(WORKER_ID, *drift_monitor.snapshot())
+    merged = DriftMonitor(drift_monitor.reference)
+    for counts in db.drift_snapshots(
+        datetime.now() - timedelta(hours=window_hours), drift_monitor.bucket_seconds
+    ):
+        merged.merge_snapshot(counts)
+    return merged.report()
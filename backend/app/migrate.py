@@ -0,0 +1,21 @@
+"""
+One-off data migrations, kept out of API startup because they lock or
+rewrite hot tables. Run from backend/ against DATABASE_URL:
+
+    python -m app.migrate
+"""
+from app.database import BurnoutDatabase
+
+
+def main():
+    db = BurnoutDatabase()
+    db.setup_database()
+    moved = db.migrate_reflections()
+    if moved is None:
+        print("reflections: already migrated")
+    else:
+        print(f"reflections: moved {moved} to checkout_reflections, individual_checkouts rewritten")
+
+
+if __name__ == "__main__":
+    main()
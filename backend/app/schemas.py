@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 class CheckoutRequest(BaseModel):
     email: str
@@ -15,6 +15,16 @@ class CheckoutRequest(BaseModel):
     sentiment_score: float
     reflection: Optional[str] = ""
 
+class Factor(BaseModel):
+    feature: str
+    contribution: float
+
 class CheckoutResponse(BaseModel):
     score: int
     label: str
+    top_factors: List[Factor] = []
+    recommendations: List[str] = []
+
+class RosterUpdate(BaseModel):
+    department: str
+    headcount: int
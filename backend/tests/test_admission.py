@@ -0,0 +1,64 @@
+"""
+AdmissionController slot accounting when queued clients go away.
+"""
+import sys
+import asyncio
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "backend"))
+from app.admission import AdmissionController
+
+
+def controller(limit=1):
+    return AdmissionController(limit, max_queue=10, deadlines={"checkout": 5, "dashboard": 5})
+
+
+def test_release_skips_waiter_cancelled_in_same_tick():
+    async def scenario():
+        admission = controller()
+        await admission.acquire("checkout")
+        queued = asyncio.ensure_future(admission.acquire("checkout"))
+        await asyncio.sleep(0)
+        # Disconnect and the running request finishing, before the
+        # cancelled waiter's cleanup runs
+        queued.cancel()
+        admission.release()
+        await asyncio.gather(queued, return_exceptions=True)
+        assert admission.in_flight == 0
+        await asyncio.wait_for(admission.acquire("checkout"), 1)
+        assert admission.in_flight == 1
+
+    asyncio.run(scenario())
+
+
+def test_release_hands_slot_to_next_live_waiter():
+    async def scenario():
+        admission = controller()
+        await admission.acquire("checkout")
+        cancelled = asyncio.ensure_future(admission.acquire("checkout"))
+        live = asyncio.ensure_future(admission.acquire("dashboard"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        admission.release()
+        await asyncio.wait_for(live, 1)
+        await asyncio.gather(cancelled, return_exceptions=True)
+        assert admission.in_flight == 1
+        admission.release()
+        assert admission.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancel_after_handover_returns_slot():
+    async def scenario():
+        admission = controller()
+        await admission.acquire("checkout")
+        queued = asyncio.ensure_future(admission.acquire("checkout"))
+        await asyncio.sleep(0)
+        admission.release()
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+        assert admission.in_flight == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,94 @@
+"""
+Sketch accuracy against exact answers on the synthetic dataset, fed in
+per (day, department) the way save_checkout does (see also
+bench/sketch_accuracy.py for the full error tables).
+"""
+import sys
+import hashlib
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "backend"))
+from app.sketches import HyperLogLog, QuantileSketch
+
+DEPARTMENTS = ["Engineering", "Marketing", "Sales", "Operations", "HR"]
+
+
+def load(scale):
+    base = pd.read_csv(ROOT / "data" / "student_burnout_synthetic.csv")
+    copies = [base.assign(user=base["user_id"] + f"#{copy}") for copy in range(scale)]
+    df = pd.concat(copies, ignore_index=True)
+    df["user_hash"] = [hashlib.sha256(u.encode()).hexdigest() for u in df["user"]]
+    df["department"] = [DEPARTMENTS[int(h[:8], 16) % len(DEPARTMENTS)] for h in df["user_hash"]]
+    return df
+
+
+def merged_hll(df):
+    daily = {}
+    for key, user in zip(zip(df["date"], df["department"]), df["user_hash"]):
+        daily.setdefault(key, HyperLogLog()).add(user)
+    merged = HyperLogLog()
+    for sketch in daily.values():
+        merged.merge(sketch)
+    return merged
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    return load(1)
+
+
+@pytest.fixture(scope="module")
+def large_dataset():
+    # 100 disjoint copies of the user base: 5000 users, beyond the
+    # linear-counting range where the raw HyperLogLog estimate applies
+    return load(100)
+
+
+@pytest.mark.parametrize("scope", [None] + DEPARTMENTS)
+def test_hll_small_counts_near_exact(dataset, scope):
+    rows = dataset if scope is None else dataset[dataset["department"] == scope]
+    exact = rows["user"].nunique()
+    assert abs(merged_hll(rows).estimate() - exact) <= 1
+
+
+@pytest.mark.parametrize("scope", [None] + DEPARTMENTS)
+def test_hll_error_within_three_sigma(large_dataset, scope):
+    rows = large_dataset if scope is None else large_dataset[large_dataset["department"] == scope]
+    sketch = merged_hll(rows)
+    exact = rows["user"].nunique()
+    assert abs(sketch.estimate() - exact) / exact <= 3 * sketch.relative_error
+
+
+def test_hll_merge_is_union(dataset):
+    first = dataset[dataset["date"] < "2025-09-15"]
+    second = dataset[dataset["date"] >= "2025-09-15"]
+    union = merged_hll(first)
+    union.merge(merged_hll(second))
+    assert union.registers == merged_hll(dataset).registers
+
+
+@pytest.mark.parametrize("field", ["self_reported_stress", "sleep_hours", "study_hours"])
+@pytest.mark.parametrize("q", [0.5, 0.9, 0.99])
+def test_quantile_within_alpha(dataset, field, q):
+    sketch = QuantileSketch()
+    for value in dataset[field]:
+        sketch.add(value)
+    exact = dataset[field].quantile(q, interpolation="lower")
+    if exact == 0:
+        assert sketch.quantile(q) == 0
+    else:
+        assert abs(sketch.quantile(q) - exact) / exact <= sketch.alpha + 1e-9
+
+
+def test_quantile_removal_restores_sketch(dataset):
+    sketch = QuantileSketch()
+    for value in dataset["self_reported_stress"]:
+        sketch.add(value)
+    before = sketch.to_json()
+    sketch.add(42, 1)
+    sketch.add(42, -1)
+    assert sketch.to_json() == before
@@ -0,0 +1,115 @@
+"""
+Load test for the admission controller (backend/app/admission.py).
+
+Simulates an open-loop burst of check-ins plus dashboard reads against
+`limit` workers with a fixed mean service time, entirely in asyncio, and
+compares admission control with the old behaviour (every request waits
+in one unbounded FIFO for a connection). For each offered load, as a
+multiple of capacity, prints per-lane latency percentiles of successful
+requests, the shed rate, and goodput: responses that arrived within
+the lane's deadline, per second.
+
+    python bench/admission_sim.py --loads 0.5 1 1.5 2 3
+"""
+import sys
+import time
+import random
+import asyncio
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT / "backend"))
+from app.admission import AdmissionController, Overloaded
+
+DEADLINES = {"checkout": 2.0, "dashboard": 5.0}
+
+
+class FifoBaseline:
+    """No admission control: one unbounded FIFO in front of the pool."""
+
+    def __init__(self, limit):
+        self._slots = asyncio.Semaphore(limit)
+
+    async def acquire(self, lane):
+        await self._slots.acquire()
+
+    def release(self, held=None):
+        self._slots.release()
+
+
+async def request(controller, lane, service, results):
+    start = time.perf_counter()
+    try:
+        await controller.acquire(lane)
+    except Overloaded:
+        results[lane].append((time.perf_counter() - start, False))
+        return
+    try:
+        await asyncio.sleep(service)
+    finally:
+        controller.release(service)
+    results[lane].append((time.perf_counter() - start, True))
+
+
+async def run(controller, rate, duration, service_ms, dashboard_share, seed):
+    rng = random.Random(seed)
+    results = {lane: [] for lane in DEADLINES}
+    tasks = []
+    deadline = time.perf_counter() + duration
+    next_at = time.perf_counter()
+    while next_at < deadline:
+        # Open loop: arrivals follow the schedule whether or not earlier
+        # requests have finished
+        await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+        lane = "dashboard" if rng.random() < dashboard_share else "checkout"
+        service = rng.expovariate(1000 / service_ms)
+        tasks.append(asyncio.create_task(request(controller, lane, service, results)))
+        next_at += rng.expovariate(rate)
+    await asyncio.gather(*tasks)
+    return results
+
+
+def summarize(samples, deadline, duration):
+    latencies = np.array([t for t, ok in samples if ok]) * 1000
+    shed = sum(1 for _, ok in samples if not ok)
+    good = int((latencies <= deadline * 1000).sum())
+    p50, p99 = np.percentile(latencies, [50, 99]) if len(latencies) else (float("nan"),) * 2
+    return p50, p99, shed / max(len(samples), 1), good / duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--limit", type=int, default=10, help="concurrency (DB_POOL_MAX)")
+    parser.add_argument("--service-ms", type=float, default=20.0, help="mean service time")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds of arrivals per run")
+    parser.add_argument("--dashboard-share", type=float, default=0.2)
+    parser.add_argument("--max-queue", type=int, default=50)
+    parser.add_argument("--loads", type=float, nargs="+", default=[0.5, 1.0, 1.5, 2.0, 3.0])
+    args = parser.parse_args()
+
+    capacity = args.limit * 1000 / args.service_ms
+    print(f"capacity {capacity:.0f} req/s ({args.limit} slots x {args.service_ms:g} ms)\n")
+    print(f"{'load':>5} {'mode':<10}{'lane':<11}{'p50_ms':>9}{'p99_ms':>9}{'shed':>7}{'goodput/s':>11}")
+    for load in args.loads:
+        for mode in ("fifo", "admission"):
+            if mode == "fifo":
+                controller = FifoBaseline(args.limit)
+            else:
+                controller = AdmissionController(
+                    args.limit, args.max_queue, DEADLINES, service_time=args.service_ms / 1000
+                )
+            results = asyncio.run(run(
+                controller, load * capacity, args.duration,
+                args.service_ms, args.dashboard_share, seed=int(load * 100)
+            ))
+            for lane, samples in results.items():
+                p50, p99, shed, goodput = summarize(samples, DEADLINES[lane], args.duration)
+                print(f"{load:>5.1f} {mode:<10}{lane:<11}{p50:>9.0f}{p99:>9.0f}{shed:>7.0%}{goodput:>11.0f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Cost of tree-path attributions versus plain prediction.
+
+Times model.predict_proba against PathAttributor.explain (which returns
+the same probabilities plus per-feature contributions) on single rows
+and on a batch, and checks that bias + contributions reproduces
+predict_proba.
+
+    python bench/attribution_bench.py --batch-rows 1000
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+from ml.explain import PathAttributor
+from ml.predict import artifacts, _feature_matrix
+
+
+def median_ms(fn, repeats):
+    fn()  # warm-up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--batch-rows", type=int, default=1000)
+    args = parser.parse_args()
+
+    df = pd.read_csv(ROOT / "data" / "student_burnout_synthetic.csv")
+    df = df.rename(columns={"class_attendance_rate": "engagement_level"})
+    model = artifacts().model
+    X = _feature_matrix(df.to_dict("records"))
+    batch = np.resize(X, (args.batch_rows, X.shape[1]))
+
+    start = time.perf_counter()
+    attributor = PathAttributor.from_model(model)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    proba, contributions = attributor.explain(X)
+    error = np.abs(proba - model.predict_proba(X)).max()
+
+    print(f"model: {type(model).__name__}, {len(attributor.roots)} trees, {attributor.table.shape[0]} nodes")
+    print(f"attributor build: {build_ms:.1f} ms, table {attributor.table.nbytes / 1024:.0f} KB")
+    print(f"max |bias + sum(contributions) - predict_proba| = {error:.2e}\n")
+
+    print(f"{'rows':>6}{'predict_proba_ms':>18}{'explain_ms':>12}{'ratio':>8}")
+    for rows in (X[:1], batch):
+        predict = median_ms(lambda: model.predict_proba(rows), args.repeats)
+        explain = median_ms(lambda: attributor.explain(rows), args.repeats)
+        print(f"{len(rows):>6}{predict:>18.3f}{explain:>12.3f}{explain / predict:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
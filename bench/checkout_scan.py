@@ -0,0 +1,155 @@
+"""
+Scan cost of individual_checkouts before and after moving reflections
+into the compressed checkout_reflections side table.
+
+In a scratch schema of DATABASE_URL, builds the old layout
+(reflection_text inline) with --rows synthetic check-ins, times the
+aggregation scans the dashboard rollups need, then runs the real
+migration (BurnoutDatabase.migrate_reflections) and times them again.
+Reports table size, median execution time and buffers touched per scan
+from EXPLAIN (ANALYZE, BUFFERS).
+
+    DATABASE_URL=... python bench/checkout_scan.py --rows 500000
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+from pathlib import Path
+
+import psycopg2
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT / "backend"), str(ROOT)]
+
+SCHEMA = "checkout_scan_bench"
+
+WORDS = [
+    "tired", "deadline", "exam", "project", "sleep", "coffee", "meeting", "anxious",
+    "productive", "behind", "group", "lab", "weekend", "family", "focus", "overwhelmed",
+]
+
+POPULATE = """
+INSERT INTO individual_checkouts (
+    user_id_hash, timestamp, date, department,
+    study_hours, sleep_hours, screen_time_hours,
+    engagement_level, assignment_deadline_missed,
+    assignments_pending, upcoming_deadline_load,
+    self_reported_stress, sentiment_score,
+    burnout_score, risk_label, reflection_text
+)
+SELECT
+    md5((g %% %(users)s)::text),
+    day::timestamp + interval '18 hours',
+    day,
+    (ARRAY['Engineering', 'Marketing', 'Sales', 'Operations', 'HR'])[1 + g %% 5],
+    random() * 10, 4 + random() * 5, 2 + random() * 10,
+    random(), (random() < 0.2)::int,
+    (random() * 8)::int, (random() * 5)::int,
+    1 + (random() * 9)::int, random() * 2 - 1,
+    (random() * 100)::int,
+    (ARRAY['Low', 'Medium', 'High'])[1 + g %% 3],
+    CASE WHEN g %% 5 < 3 THEN (
+        SELECT string_agg((%(words)s::text[])[1 + (random() * 15)::int], ' ')
+        FROM generate_series(1, 10 + (g::bigint * 7919) %% 250)
+    ) ELSE '' END
+FROM generate_series(0, %(rows)s - 1) AS g,
+     LATERAL (SELECT DATE '2025-01-01' + g / %(users)s AS day) d
+"""
+
+SCANS = {
+    "daily dept rollup (all days)": """
+        SELECT date, department, AVG(self_reported_stress), AVG(sleep_hours),
+               AVG(assignments_pending + upcoming_deadline_load),
+               COUNT(*) FILTER (WHERE risk_label = 'High'), COUNT(*)
+        FROM individual_checkouts
+        GROUP BY date, department
+    """,
+    "org summary (last 30 days)": """
+        SELECT AVG(self_reported_stress), AVG(sleep_hours), AVG(burnout_score), COUNT(*)
+        FROM individual_checkouts
+        WHERE date > (SELECT MAX(date) FROM individual_checkouts) - 30
+    """,
+}
+
+
+def scratch_url(url):
+    separator = "&" if "?" in url else "?"
+    return f"{url}{separator}options=-csearch_path%3D{SCHEMA}"
+
+
+def measure(conn, repeats):
+    cur = conn.cursor()
+    cur.execute("SELECT pg_relation_size('individual_checkouts'), pg_total_relation_size('individual_checkouts')")
+    heap, total = cur.fetchone()
+    results = {}
+    for name, sql in SCANS.items():
+        timings, buffers = [], 0
+        for _ in range(repeats):
+            cur.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + sql)
+            plan = cur.fetchone()[0][0]
+            timings.append(plan["Execution Time"])
+            top = plan["Plan"]
+            buffers = top.get("Shared Hit Blocks", 0) + top.get("Shared Read Blocks", 0)
+        results[name] = (statistics.median(timings), buffers)
+    return heap, total, results
+
+
+def report(label, heap, total, results):
+    print(f"{label}: heap {heap / 2**20:.1f} MB, with TOAST and indexes {total / 2**20:.1f} MB")
+    for name, (ms, buffers) in results.items():
+        print(f"  {name:<30}{ms:>9.1f} ms{buffers:>9} buffers")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    url = os.environ["DATABASE_URL"]
+    admin = psycopg2.connect(url)
+    admin.autocommit = True
+    admin.cursor().execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; CREATE SCHEMA {SCHEMA}")
+
+    os.environ["DATABASE_URL"] = scratch_url(url)
+    from app.database import BurnoutDatabase
+    db = BurnoutDatabase()
+    db.setup_database()
+
+    conn = db.get_connection()
+    conn.autocommit = True
+    cur = conn.cursor()
+    # Recreate the pre-migration layout: reflections inline
+    cur.execute("DROP TABLE checkout_reflections")
+    cur.execute("ALTER TABLE individual_checkouts ADD COLUMN reflection_text TEXT")
+    start = time.perf_counter()
+    cur.execute(POPULATE, {"rows": args.rows, "users": args.users, "words": WORDS})
+    cur.execute("VACUUM ANALYZE individual_checkouts")
+    print(f"loaded {args.rows} check-ins in {time.perf_counter() - start:.1f} s\n")
+
+    report("before (inline reflection_text)", *measure(conn, args.repeats))
+
+    # What a deploy does: the new code's startup creates the side table,
+    # then the one-off migration (python -m app.migrate) fills it
+    db.setup_database()
+    start = time.perf_counter()
+    db.migrate_reflections()
+    migration_s = time.perf_counter() - start
+    cur.execute("ANALYZE individual_checkouts")
+    cur.execute("SELECT COUNT(*), pg_total_relation_size('checkout_reflections') FROM checkout_reflections")
+    moved, side = cur.fetchone()
+    print(f"\nmigration: {moved} reflections moved in {migration_s:.1f} s, "
+          f"side table {side / 2**20:.1f} MB compressed\n")
+
+    report("after (checkout_reflections)", *measure(conn, args.repeats))
+
+    conn.close()
+    admin.cursor().execute(f"DROP SCHEMA {SCHEMA} CASCADE")
+    admin.close()
+
+
+if __name__ == "__main__":
+    main()
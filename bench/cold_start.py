@@ -0,0 +1,132 @@
+"""
+Cold-start profile of the API process.
+
+For each serving mode a fresh interpreter imports app.main, runs the
+startup hook and serves its first /checkout (through FastAPI's
+TestClient; requires DATABASE_URL) or, without a database, its first
+prediction. Reports wall time from process spawn to import, to ready
+and to first response, peak RSS, and which heavy libraries got loaded;
+plus the slowest top-level imports from `python -X importtime`.
+
+    python bench/cold_start.py
+    git worktree add /tmp/before <rev> && python bench/cold_start.py --root /tmp/before --modes lazy
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+MODES = {
+    "lazy": {},
+    "prewarm": {"BURNOUT_PREWARM": "1"},
+    "snapshot": {"BURNOUT_PREWARM": "1", "BURNOUT_USE_SNAPSHOT": "1"},
+}
+
+HEAVY = ("pandas", "sklearn", "joblib", "scipy")
+
+PAYLOAD = {
+    "email": "cold-start@bench.local", "department": "Bench",
+    "study_hours": 6, "sleep_hours": 7, "screen_time_hours": 8,
+    "engagement_level": 0.8, "assignment_deadline_missed": 0,
+    "assignments_pending": 3, "upcoming_deadline_load": 2,
+    "self_reported_stress": 5, "sentiment_score": 0.0, "reflection": "",
+}
+
+CHILD = """
+import json, os, resource, sys, time
+sys.path[:0] = [os.path.join(ROOT, "backend"), ROOT]
+import warnings; warnings.simplefilter("ignore")
+marks = {}
+from app.main import app
+marks["import"] = time.time()
+if os.getenv("BENCH_HTTP") == "1":
+    from fastapi.testclient import TestClient
+    with TestClient(app) as client:
+        marks["ready"] = time.time()
+        client.post("/checkout", json=PAYLOAD).raise_for_status()
+        marks["first_response"] = time.time()
+else:
+    marks["ready"] = marks["import"]
+    try:
+        from ml.predict import explain_burnout as predict
+    except ImportError:
+        from ml.predict import predict_burnout as predict
+    predict(PAYLOAD)
+    marks["first_response"] = time.time()
+marks["rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+marks["heavy"] = [m for m in HEAVY if m in sys.modules]
+print(json.dumps(marks))
+"""
+
+
+def run_mode(root, env_overrides, http):
+    env = dict(os.environ, **env_overrides)
+    env.setdefault("DATABASE_URL", "postgresql://unused")
+    env["BENCH_HTTP"] = "1" if http else "0"
+    code = f"ROOT = {str(root)!r}\nPAYLOAD = {PAYLOAD!r}\nHEAVY = {HEAVY!r}\n" + CHILD
+    spawned = time.time()
+    out = subprocess.run(
+        [sys.executable, "-c", code], env=env, cwd=root / "backend",
+        capture_output=True, text=True, check=True
+    )
+    marks = json.loads(out.stdout.strip().splitlines()[-1])
+    for key in ("import", "ready", "first_response"):
+        marks[key] = (marks[key] - spawned) * 1000
+    return marks
+
+
+def import_profile(root, top):
+    env = dict(os.environ, DATABASE_URL=os.getenv("DATABASE_URL", "postgresql://unused"))
+    env["PYTHONPATH"] = os.pathsep.join([str(root / "backend"), str(root)])
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        env=env, cwd=root / "backend", capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:  # modules imported directly by app.main
+            rows.append((int(cumulative_us), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--root", type=Path, default=ROOT, help="checkout to profile")
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES))
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes per mode (median reported)")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    args = parser.parse_args()
+
+    http = bool(os.getenv("DATABASE_URL"))
+    if "snapshot" in args.modes:
+        sys.path.append(str(args.root))
+        from ml.predict import SNAPSHOT_PATH, save_snapshot
+        if not SNAPSHOT_PATH.exists():
+            save_snapshot()
+
+    print(f"first response measured via {'HTTP /checkout' if http else 'direct prediction (no DATABASE_URL)'}\n")
+    print(f"{'mode':<10}{'import_ms':>11}{'ready_ms':>10}{'first_ms':>10}{'rss_mb':>8}  heavy modules")
+    for mode in args.modes:
+        runs = [run_mode(args.root, MODES[mode], http) for _ in range(args.runs)]
+        pick = sorted(runs, key=lambda r: r["first_response"])[len(runs) // 2]
+        print(
+            f"{mode:<10}{pick['import']:>11.0f}{pick['ready']:>10.0f}{pick['first_response']:>10.0f}"
+            f"{pick['rss_mb']:>8.0f}  {', '.join(pick['heavy']) or '-'}"
+        )
+
+    print("\nslowest imports under app.main (cumulative ms):")
+    for cumulative_us, name in import_profile(args.root, args.top):
+        print(f"{cumulative_us / 1000:>9.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""
+Open-loop replay of the synthetic dataset against the API.
+
+Rows of data/student_burnout_synthetic.csv become POST /checkout requests
+sent on a precomputed arrival schedule (constant, Poisson, or Poisson
+with periodic reminder bursts), whether or not earlier requests have
+returned. Dashboard reads (/org/summary, /dept/aggregates,
+/dept/quantiles, /participation) are interleaved at their own rate.
+Latency is measured from each request's scheduled send time, so queueing
+inside the client is not hidden (no coordinated omission), and recorded
+in HDR-style log-linear histograms. Running several --rates gives a
+saturation curve for one deployment configuration.
+
+Check-ins are really written, so point it at a disposable database.
+Every request gets its own identity (<user>.<dataset date>.<run and
+rate nonce>@replay.local), because the API files all check-ins under
+today's date: replaying a user's rows from different days under one
+email would turn most writes into same-day re-submissions and
+exercise the wrong path. --in-process shares one event loop between the
+client and the app; client_lag_p99 shows when that skews the numbers.
+
+    python bench/replay.py --url http://localhost:8000 --rates 50 100 200 400
+    DATABASE_URL=... python bench/replay.py --in-process --shape burst --rates 100
+"""
+import sys
+import math
+import time
+import random
+import asyncio
+import argparse
+import hashlib
+import secrets
+import contextlib
+from pathlib import Path
+from datetime import date, timedelta
+
+import httpx
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DEPARTMENTS = ["Engineering", "Marketing", "Sales", "Operations", "HR"]
+
+PERCENTILES = (50, 90, 99, 99.9, 99.99)
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram in the style of HdrHistogram: values (in
+    microseconds) are bucketed by power of two, each split into
+    `sub_buckets` linear slots, so every recorded value is kept to
+    within 1 / sub_buckets relative precision (< 1% by default) in
+    fixed memory, over any range.
+    """
+
+    def __init__(self, sub_buckets=128):
+        self.sub_buckets = sub_buckets
+        self.counts = {}
+        self.total = 0
+        self.max = 0
+
+    def _index(self, value):
+        if value < self.sub_buckets:
+            return 0, value
+        exponent = value.bit_length() - self.sub_buckets.bit_length()
+        return exponent + 1, value >> exponent
+
+    def _value(self, index):
+        exponent, sub = index
+        # Upper edge of the slot, so percentiles never understate
+        return sub if exponent == 0 else ((sub + 1) << (exponent - 1)) - 1
+
+    def record(self, seconds):
+        value = max(1, int(seconds * 1e6))
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total += 1
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, p):
+        """Latency in ms at percentile p (0-100), or None when empty."""
+        if not self.total:
+            return None
+        rank = math.ceil(p / 100 * self.total)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._value(index), self.max) / 1000
+        return self.max / 1000
+
+    def distribution(self):
+        """(percentile, ms) pairs on the usual HDR percentile ladder."""
+        ladder, p = [], 0.0
+        while p < 99.999 and self.total:
+            ladder.append((p, self.percentile(p)))
+            p += (100 - p) / 2
+        return ladder + [(100.0, self.max / 1000)]
+
+
+def load_payloads(nonce, rows=None):
+    df = pd.read_csv(ROOT / "data" / "student_burnout_synthetic.csv")
+    df = df.rename(columns={"class_attendance_rate": "engagement_level"})
+    payloads = []
+    for record in df.to_dict("records")[:rows]:
+        user = record.pop("user_id")
+        digest = hashlib.sha256(user.encode()).hexdigest()
+        day = record.pop("date")
+        record.pop("burnout_risk_label")
+        record["email"] = f"{user.lower()}.{day}.{nonce}@replay.local"
+        record["department"] = DEPARTMENTS[int(digest[:8], 16) % len(DEPARTMENTS)]
+        record["reflection"] = ""
+        payloads.append(record)
+    return payloads
+
+
+def dashboard_requests():
+    end = date.today()
+    window = {"start": str(end - timedelta(days=30)), "end": str(end)}
+    return [
+        ("/org/summary", window),
+        ("/dept/aggregates", window),
+        ("/dept/quantiles", window),
+        ("/participation", window),
+    ]
+
+
+def schedule(shape, rate, duration, rng, burst_factor=5.0, burst_seconds=2.0, burst_every=10.0):
+    """
+    Send offsets (seconds from start) for an arrival process averaging
+    `rate` per second. "burst" runs at rate * burst_factor for
+    burst_seconds out of every burst_every, and proportionally lower in
+    between, keeping the same mean.
+    """
+    if rate <= 0:
+        return []
+    if shape == "constant":
+        return [i / rate for i in range(int(rate * duration))]
+    if shape == "poisson":
+        offsets, t = [], rng.expovariate(rate)
+        while t < duration:
+            offsets.append(t)
+            t += rng.expovariate(rate)
+        return offsets
+    quiet = max(0.0, rate * (burst_every - burst_factor * burst_seconds) / (burst_every - burst_seconds))
+    offsets, t = [], 0.0
+    while t < duration:
+        in_burst = t % burst_every < burst_seconds
+        current = rate * burst_factor if in_burst else quiet
+        if current <= 0:
+            t = (t // burst_every + 1) * burst_every
+            continue
+        t += rng.expovariate(current)
+        if t < duration:
+            offsets.append(t)
+    return offsets
+
+
+class Run:
+    def __init__(self):
+        self.histograms = {"checkout": LatencyHistogram(), "dashboard": LatencyHistogram()}
+        self.statuses = {"checkout": {}, "dashboard": {}}
+        self.lag = LatencyHistogram()
+
+    def record(self, kind, outcome, seconds):
+        statuses = self.statuses[kind]
+        statuses[outcome] = statuses.get(outcome, 0) + 1
+        if outcome == 200:
+            self.histograms[kind].record(seconds)
+
+    def errors(self, kind):
+        statuses = self.statuses[kind]
+        total = sum(statuses.values())
+        return (total - statuses.get(200, 0)) / total if total else 0.0
+
+
+async def fire(client, run, kind, intended, timeout, method, path, **kwargs):
+    # Any delay between the scheduled time and the actual send is the
+    # client falling behind, and is charged to the request
+    run.lag.record(max(0.0, time.perf_counter() - intended))
+    try:
+        # httpx timeouts are per phase; bound the whole exchange instead
+        response = await asyncio.wait_for(client.request(method, path, **kwargs), timeout)
+        outcome = response.status_code
+    except (asyncio.TimeoutError, httpx.TimeoutException):
+        outcome = "timeout"
+    except httpx.TransportError:
+        outcome = "connection_error"
+    run.record(kind, outcome, time.perf_counter() - intended)
+
+
+async def replay(client, payloads, args, rate, seed):
+    """
+    One open-loop step at `rate`. Payloads are sent in order; once they
+    run out, repeats get a cycle prefix on the email so every check-in
+    stays a first-time one.
+    """
+    rng = random.Random(seed)
+    events = [(t, "checkout") for t in schedule(args.shape, rate, args.duration, rng)]
+    dashboard_rate = rate * args.dashboard_ratio
+    events += [(t, "dashboard") for t in schedule("poisson", dashboard_rate, args.duration, rng)]
+    events.sort()
+
+    reads = dashboard_requests()
+    run, tasks = Run(), []
+    sent = 0
+    start = time.perf_counter()
+    for i, (offset, kind) in enumerate(events):
+        intended = start + offset
+        delay = intended - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if kind == "checkout":
+            cycle, index = divmod(sent, len(payloads))
+            payload = payloads[index]
+            if cycle:
+                payload = dict(payload, email=f"c{cycle}.{payload['email']}")
+            sent += 1
+            request = ("POST", "/checkout", {"json": payload})
+        else:
+            path, params = reads[i % len(reads)]
+            request = ("GET", path, {"params": params})
+        method, path, kwargs = request
+        tasks.append(asyncio.create_task(fire(client, run, kind, intended, args.timeout, method, path, **kwargs)))
+    await asyncio.gather(*tasks)
+    return run, time.perf_counter() - start
+
+
+async def open_client(args):
+    limits = httpx.Limits(max_connections=args.max_connections, max_keepalive_connections=args.max_connections)
+    timeout = httpx.Timeout(args.timeout)
+    if not args.in_process:
+        return httpx.AsyncClient(base_url=args.url, limits=limits, timeout=timeout), None
+
+    sys.path[:0] = [str(ROOT / "backend"), str(ROOT)]
+    from app.main import app
+    transport = httpx.ASGITransport(app=app)
+    return httpx.AsyncClient(transport=transport, base_url="http://replay", limits=limits, timeout=timeout), app
+
+
+def print_distribution(name, histogram):
+    print(f"\n{name} latency distribution (ms, from scheduled send time)")
+    for p, ms in histogram.distribution():
+        print(f"  {p:>9.4f}%  {ms:>10.2f}")
+
+
+async def main_async(args):
+    nonce = secrets.token_hex(4)
+    client, app = await open_client(args)
+    target = "in-process ASGI app" if args.in_process else args.url
+    print(f"target: {target}  shape: {args.shape}  duration: {args.duration:g}s  "
+          f"dashboard reads: {args.dashboard_ratio:.0%} of check-in rate  {args.label}\n")
+
+    header = f"{'rate':>6}{'achieved':>10}" + "".join(f"{'p' + format(p, 'g'):>9}" for p in PERCENTILES[:4])
+    print(header + f"{'max':>9}{'errors':>8}{'dash_p99':>10}{'dash_err':>10}{'client_lag_p99':>16}")
+    curve = []
+    async with contextlib.AsyncExitStack() as stack:
+        await stack.enter_async_context(client)
+        if app is not None:
+            # ASGITransport does not send lifespan events; run startup here
+            await stack.enter_async_context(app.router.lifespan_context(app))
+        for rate in args.rates:
+            # Fresh identities per step, so no step re-submits another's check-ins
+            payloads = load_payloads(f"{nonce}-{rate:g}", args.rows)
+            run, elapsed = await replay(client, payloads, args, rate, seed=int(rate))
+            checkout = run.histograms["checkout"]
+            completed = sum(run.statuses["checkout"].values())
+            row = {
+                "rate": rate,
+                "achieved": completed / elapsed,
+                **{f"p{p:g}": checkout.percentile(p) for p in PERCENTILES},
+                "max": checkout.max / 1000,
+                "error_rate": run.errors("checkout"),
+                "dashboard_p99": run.histograms["dashboard"].percentile(99),
+                "dashboard_error_rate": run.errors("dashboard"),
+                "client_lag_p99": run.lag.percentile(99),
+                "statuses": run.statuses,
+            }
+            curve.append(row)
+
+            def ms(value):
+                return f"{value:>9.1f}" if value is not None else f"{'-':>9}"
+
+            print(
+                f"{rate:>6g}{row['achieved']:>10.1f}"
+                + "".join(ms(row[f"p{p:g}"]) for p in PERCENTILES[:4])
+                + f"{ms(row['max'])}{row['error_rate']:>8.1%}{ms(row['dashboard_p99']):>10}"
+                + f"{row['dashboard_error_rate']:>10.1%}{ms(row['client_lag_p99']):>16}"
+            )
+            if args.verbose:
+                print(f"        statuses: {run.statuses}")
+                print_distribution("check-in", checkout)
+
+    if args.csv:
+        pd.DataFrame([{k: v for k, v in row.items() if k != "statuses"} for row in curve]).to_csv(args.csv, index=False)
+        print(f"\nsaturation curve written to {args.csv}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", default="http://localhost:8000", help="running API to load")
+    target.add_argument("--in-process", action="store_true",
+                        help="drive backend/app/main.py through ASGITransport (needs DATABASE_URL)")
+    parser.add_argument("--rates", type=float, nargs="+", default=[25, 50, 100, 200],
+                        help="mean check-ins per second; one run per rate")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per run")
+    parser.add_argument("--shape", choices=("constant", "poisson", "burst"), default="poisson")
+    parser.add_argument("--dashboard-ratio", type=float, default=0.1,
+                        help="dashboard reads per check-in")
+    parser.add_argument("--rows", type=int, default=None, help="replay only the first N rows")
+    parser.add_argument("--timeout", type=float, default=10.0, help="seconds before a request counts as failed")
+    parser.add_argument("--max-connections", type=int, default=500)
+    parser.add_argument("--label", default="", help="deployment description printed with the results")
+    parser.add_argument("--csv", help="write the saturation curve to this file")
+    parser.add_argument("--verbose", action="store_true", help="print status counts and full distributions")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
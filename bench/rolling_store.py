@@ -0,0 +1,86 @@
+"""
+Per-check-in storage cost of the rolling feature store.
+
+ml/train.py --rolling compares model serving time only. The variant's
+real extra work per check-in is _update_rolling: a SELECT ... FOR UPDATE
+on user_rolling_features plus an upsert of the JSON ring buffer, in the
+check-in's transaction. In a scratch schema of DATABASE_URL, this seeds
+--users users with 30 days of stored state, then times today's
+save_checkout for each of them, alternating with and without the
+rolling step, and reports medians and the difference.
+
+    DATABASE_URL=... python bench/rolling_store.py --users 2000
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+from pathlib import Path
+from datetime import date, timedelta
+
+import psycopg2
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT / "backend"), str(ROOT)]
+
+SCHEMA = "rolling_store_bench"
+
+CHECKIN = {
+    "study_hours": 5.0, "sleep_hours": 6.5, "screen_time_hours": 7.0,
+    "engagement_level": 0.7, "assignment_deadline_missed": 0,
+    "assignments_pending": 2, "upcoming_deadline_load": 1,
+    "self_reported_stress": 6, "sentiment_score": 0.1,
+}
+
+
+def scratch_url(url):
+    separator = "&" if "?" in url else "?"
+    return f"{url}{separator}options=-csearch_path%3D{SCHEMA}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=1_000)
+    args = parser.parse_args()
+
+    url = os.environ["DATABASE_URL"]
+    admin = psycopg2.connect(url)
+    admin.autocommit = True
+    admin.cursor().execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; CREATE SCHEMA {SCHEMA}")
+
+    os.environ["DATABASE_URL"] = scratch_url(url)
+    from app.database import BurnoutDatabase
+    db = BurnoutDatabase()
+    db.setup_database()
+
+    emails = [f"user{i}@bench.local" for i in range(args.users)]
+    today = date.today()
+    with db.connection() as conn:
+        cur = conn.cursor()
+        for email in emails:
+            user = db.hash_user(email)
+            for days_ago in range(30, 0, -1):
+                db._update_rolling(cur, user, today - timedelta(days=days_ago), CHECKIN)
+
+    update_rolling = db._update_rolling
+    timings = {"with rolling": [], "without rolling": []}
+    for i, email in enumerate(emails):
+        name = "with rolling" if i % 2 == 0 else "without rolling"
+        db._update_rolling = update_rolling if i % 2 == 0 else (lambda *args: None)
+        start = time.perf_counter()
+        db.save_checkout(email, "Engineering", CHECKIN, 40, "Medium")
+        timings[name].append((time.perf_counter() - start) * 1000)
+    db._update_rolling = update_rolling
+
+    medians = {name: statistics.median(ms) for name, ms in timings.items()}
+    for name, ms in medians.items():
+        print(f"save_checkout {name:<16}{ms:>8.3f} ms median over {len(timings[name])}")
+    print(f"rolling store per check-in    {medians['with rolling'] - medians['without rolling']:>8.3f} ms")
+
+    admin.cursor().execute(f"DROP SCHEMA {SCHEMA} CASCADE")
+    admin.close()
+
+
+if __name__ == "__main__":
+    main()
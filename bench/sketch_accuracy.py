@@ -0,0 +1,95 @@
+"""
+Accuracy of the ingest-time sketches against exact answers on the
+synthetic dataset.
+
+Every (user, day) row of data/student_burnout_synthetic.csv is fed into
+per-(day, department) sketches exactly as save_checkout does; distinct
+participants and stress quantiles are then answered by merging sketches
+over days, weeks and the whole range and compared with exact values.
+--scale N replays the dataset with N disjoint copies of the user base to
+exercise the sketches beyond 50 users.
+
+    python bench/sketch_accuracy.py --scale 100
+"""
+import sys
+import argparse
+import hashlib
+from pathlib import Path
+from datetime import timedelta
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT / "backend"))
+from app.sketches import HyperLogLog, QuantileSketch
+
+DEPARTMENTS = ["Engineering", "Marketing", "Sales", "Operations", "HR"]
+
+
+def load(scale):
+    base = pd.read_csv(ROOT / "data" / "student_burnout_synthetic.csv")
+    copies = []
+    for copy in range(scale):
+        df = base.copy()
+        df["user"] = df["user_id"] + f"#{copy}"
+        copies.append(df)
+    df = pd.concat(copies, ignore_index=True)
+    df["user_hash"] = [hashlib.sha256(u.encode()).hexdigest() for u in df["user"]]
+    df["department"] = [DEPARTMENTS[int(h[:8], 16) % len(DEPARTMENTS)] for h in df["user_hash"]]
+    df["date"] = pd.to_datetime(df["date"]).dt.date
+    return df
+
+
+def build_sketches(df):
+    hll, stress = {}, {}
+    for day, dept, user, value in zip(df["date"], df["department"], df["user_hash"], df["self_reported_stress"]):
+        hll.setdefault((day, dept), HyperLogLog()).add(user)
+        stress.setdefault((day, dept), QuantileSketch()).add(value)
+    return hll, stress
+
+
+def ranges(df):
+    first, last = min(df["date"]), max(df["date"])
+    days = (last - first).days + 1
+    yield "day", [(first + timedelta(d), first + timedelta(d)) for d in range(days)]
+    yield "week", [(first + timedelta(d), first + timedelta(d + 6)) for d in range(0, days - 6, 7)]
+    yield "all", [(first, last)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", type=int, default=1, help="copies of the user base")
+    args = parser.parse_args()
+
+    df = load(args.scale)
+    hll, stress = build_sketches(df)
+    print(f"{len(df)} check-ins, {df['user'].nunique()} users, {len(hll)} (day, dept) sketches")
+    print(f"HyperLogLog standard error: {HyperLogLog().relative_error:.2%}\n")
+
+    print(f"{'range':<6}{'scope':<13}{'queries':>8}{'hll_mean_err':>14}{'hll_max_err':>13}{'p90_max_err':>13}")
+    for name, windows in ranges(df):
+        for scope in [None] + DEPARTMENTS:
+            hll_errors, p90_errors = [], []
+            for lo, hi in windows:
+                rows = df[(df["date"] >= lo) & (df["date"] <= hi)]
+                if scope:
+                    rows = rows[rows["department"] == scope]
+                if rows.empty:
+                    continue
+                merged, sketch = HyperLogLog(), QuantileSketch()
+                for (day, dept), s in hll.items():
+                    if lo <= day <= hi and (scope is None or dept == scope):
+                        merged.merge(s)
+                        sketch.merge(stress[(day, dept)])
+                exact = rows["user"].nunique()
+                hll_errors.append(abs(merged.estimate() - exact) / exact)
+                exact_p90 = rows["self_reported_stress"].quantile(0.9, interpolation="lower")
+                p90_errors.append(abs(sketch.quantile(0.9) - exact_p90) / exact_p90)
+            if hll_errors:
+                print(
+                    f"{name:<6}{scope or 'all':<13}{len(hll_errors):>8}"
+                    f"{sum(hll_errors) / len(hll_errors):>14.2%}{max(hll_errors):>13.2%}{max(p90_errors):>13.2%}"
+                )
+
+
+if __name__ == "__main__":
+    main()
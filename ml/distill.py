@@ -0,0 +1,129 @@
+import sys
+import json
+import time
+import tempfile
+import argparse
+from pathlib import Path
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent
+sys.path.append(str(project_root))
+import numpy as np
+import joblib
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import f1_score
+from ml.train import MODEL_DIR, features, load_dataset, split_dataset
+
+REPORT_PATH = MODEL_DIR / "distillation_report.json"
+
+
+def students():
+    """
+    Compact candidates for replacing the 200-tree teacher forest.
+    """
+    return {
+        "tree_depth4": DecisionTreeClassifier(max_depth=4, random_state=42),
+        "tree_depth6": DecisionTreeClassifier(max_depth=6, random_state=42),
+        "forest_10x6": RandomForestClassifier(n_estimators=10, max_depth=6, random_state=42),
+        "logistic": LogisticRegression(max_iter=1000),
+    }
+
+
+def fit_soft(model, X, soft_targets):
+    """
+    Fit a classifier on the teacher's class probabilities.
+
+    Each row is repeated once per class with that class's probability as
+    its sample weight, so minimizing weighted log-loss (or weighted
+    impurity for trees) is the same as fitting the soft targets.
+    """
+    n, k = soft_targets.shape
+    X_rep = np.repeat(X, k, axis=0)
+    y_rep = np.tile(np.arange(k), n)
+    w_rep = soft_targets.ravel()
+    keep = w_rep > 0
+    model.fit(X_rep[keep], y_rep[keep], sample_weight=w_rep[keep])
+    return model
+
+
+def size_on_disk(model):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "model.pkl"
+        joblib.dump(model, path)
+        return path.stat().st_size
+
+
+def latency_ms(model, X, repeats):
+    """
+    Median wall time of predict_proba on X, in milliseconds.
+    """
+    model.predict_proba(X)  # warm-up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict_proba(X)
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def evaluate(model, X_test, y_test, teacher_pred, batch, repeats):
+    pred = model.predict(X_test)
+    return {
+        "macro_f1": float(f1_score(y_test, pred, average="macro")),
+        "teacher_agreement": float((pred == teacher_pred).mean()),
+        "size_bytes": size_on_disk(model),
+        "single_row_ms": latency_ms(model, X_test[:1], repeats),
+        "batch_ms": latency_ms(model, batch, max(1, repeats // 10)),
+        "batch_rows": len(batch),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distill the burnout forest into compact students.")
+    parser.add_argument("--repeats", type=int, default=200, help="timing repetitions per model")
+    parser.add_argument("--batch-rows", type=int, default=1000, help="rows in the batch latency test")
+    parser.add_argument(
+        "--export", metavar="NAME", choices=list(students()),
+        help="save this student as burnout_model_<NAME>.pkl"
+    )
+    args = parser.parse_args()
+
+    teacher = joblib.load(MODEL_DIR / "burnout_model.pkl")
+    scaler = joblib.load(MODEL_DIR / "scaler.pkl")
+    encoder = joblib.load(MODEL_DIR / "label_encoder.pkl")
+
+    # Reproduce the teacher's split so students are scored on unseen rows
+    df = load_dataset()
+    X_scaled = scaler.transform(df[features])
+    y_enc = encoder.transform(df["burnout_risk_label"])
+    X_train, X_test, y_train, y_test = split_dataset(X_scaled, y_enc)
+
+    soft_targets = teacher.predict_proba(X_train)
+    teacher_pred = teacher.predict(X_test)
+    batch = np.resize(X_test, (args.batch_rows, X_test.shape[1]))
+
+    report = {"teacher": evaluate(teacher, X_test, y_test, teacher_pred, batch, args.repeats)}
+    fitted = {}
+    for name, model in students().items():
+        fitted[name] = fit_soft(model, X_train, soft_targets)
+        report[name] = evaluate(fitted[name], X_test, y_test, teacher_pred, batch, args.repeats)
+
+    print(f"{'model':<14}{'macro_f1':>10}{'agree':>8}{'size_kb':>10}{'1row_ms':>10}{'batch_ms':>10}")
+    for name, row in report.items():
+        print(
+            f"{name:<14}{row['macro_f1']:>10.3f}{row['teacher_agreement']:>8.3f}"
+            f"{row['size_bytes'] / 1024:>10.1f}{row['single_row_ms']:>10.3f}{row['batch_ms']:>10.2f}"
+        )
+
+    REPORT_PATH.write_text(json.dumps(report, indent=2))
+    print(f"Report written to {REPORT_PATH}")
+
+    if args.export:
+        path = MODEL_DIR / f"burnout_model_{args.export}.pkl"
+        joblib.dump(fitted[args.export], path)
+        print(f"Student saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+import sys
+import json
+import math
+import bisect
+import threading
+from datetime import datetime
+from pathlib import Path
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent
+sys.path.append(str(project_root))
+
+MODEL_DIR = project_root / "backend" / "models"
+REFERENCE_PATH = MODEL_DIR / "drift_reference.json"
+
+# Population Stability Index bands (industry rule of thumb)
+PSI_MODERATE = 0.1
+PSI_SIGNIFICANT = 0.25
+
+# Workers publish counts per bucket of this length, so reports can
+# select a time window instead of each worker's whole lifetime
+BUCKET_SECONDS = 3600
+
+
+class StreamingHistogram:
+    """
+    Fixed-memory histogram over precomputed bin edges.
+
+    Bucket i holds values in [edges[i-1], edges[i]); the first and last
+    buckets catch everything below/above the reference range. Updates
+    are a bisect over ~10 edges, and two histograms with the same edges
+    merge by adding counts.
+    """
+
+    def __init__(self, edges, counts=None):
+        self.edges = list(edges)
+        self.counts = list(counts) if counts else [0] * (len(self.edges) + 1)
+
+    def update(self, value):
+        self.counts[bisect.bisect_right(self.edges, value)] += 1
+
+    def merge(self, other):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+
+    @property
+    def total(self):
+        return sum(self.counts)
+
+    def proportions(self):
+        total = self.total
+        return [c / total for c in self.counts] if total else [0.0] * len(self.counts)
+
+
+def psi(expected, actual, eps=1e-4):
+    """
+    Population Stability Index between two bucket-proportion vectors.
+    """
+    score = 0.0
+    for e, a in zip(expected, actual):
+        e, a = max(e, eps), max(a, eps)
+        score += (a - e) * math.log(a / e)
+    return score
+
+
+def ks(expected, actual):
+    """
+    Kolmogorov–Smirnov statistic on the binned CDFs.
+    """
+    cdf_e = cdf_a = stat = 0.0
+    for e, a in zip(expected, actual):
+        cdf_e += e
+        cdf_a += a
+        stat = max(stat, abs(cdf_e - cdf_a))
+    return stat
+
+
+class DriftMonitor:
+    """
+    Live per-feature histograms compared against the training reference.
+
+    observe() is O(features). Counts cover the current time bucket only:
+    rotate() hands back the finished bucket and starts a new one, and
+    snapshot()/merge_snapshot() let each worker publish its buckets so a
+    report can cover the whole deployment over a chosen window.
+    """
+
+    def __init__(self, reference, bucket_seconds=BUCKET_SECONDS):
+        self.reference = reference
+        self.features = list(reference)
+        self.bucket_seconds = bucket_seconds
+        self.bucket_start = self._bucket(datetime.now())
+        self.histograms = self._empty()
+        self.observed = 0
+        self._lock = threading.Lock()
+
+    def _empty(self):
+        return {
+            f: StreamingHistogram(self.reference[f]["edges"]) for f in self.features
+        }
+
+    def _bucket(self, now):
+        ts = now.timestamp()
+        return datetime.fromtimestamp(ts - ts % self.bucket_seconds)
+
+    @classmethod
+    def load(cls, path=REFERENCE_PATH):
+        """
+        Monitor for the saved reference, or None if none was saved.
+        """
+        path = Path(path)
+        if not path.exists():
+            return None
+        return cls(json.loads(path.read_text()))
+
+    def observe(self, row):
+        """
+        Record one feature vector, ordered like the reference features.
+        """
+        with self._lock:
+            for feature, value in zip(self.features, row):
+                self.histograms[feature].update(value)
+            self.observed += 1
+
+    def rotate(self, now=None):
+        """
+        If the current bucket has ended, start an empty one and return
+        the finished bucket as (bucket_start, counts); otherwise None.
+        """
+        bucket = self._bucket(now or datetime.now())
+        with self._lock:
+            if bucket == self.bucket_start:
+                return None
+            finished = (self.bucket_start, self._counts())
+            self.bucket_start = bucket
+            self.histograms = self._empty()
+            return finished
+
+    def _counts(self):
+        return {f: list(h.counts) for f, h in self.histograms.items()}
+
+    def snapshot(self):
+        """(bucket_start, counts) of the current bucket."""
+        with self._lock:
+            return self.bucket_start, self._counts()
+
+    def merge_snapshot(self, counts):
+        with self._lock:
+            for feature, hist in self.histograms.items():
+                if feature in counts:
+                    hist.merge(StreamingHistogram(hist.edges, counts[feature]))
+
+    def report(self):
+        result = {}
+        for feature, hist in self.histograms.items():
+            expected = self.reference[feature]["proportions"]
+            actual = hist.proportions()
+            score = psi(expected, actual) if hist.total else None
+            if score is None:
+                status = "no_data"
+            elif score >= PSI_SIGNIFICANT:
+                status = "significant"
+            elif score >= PSI_MODERATE:
+                status = "moderate"
+            else:
+                status = "ok"
+            result[feature] = {
+                "n": hist.total,
+                "psi": score,
+                "ks": ks(expected, actual) if hist.total else None,
+                "status": status,
+            }
+        return result
+
+
+def build_reference(X, bins=10):
+    """
+    Reference histograms from a training feature frame: interior edges at
+    the training deciles (deduplicated for discrete features) and the
+    training proportions per bucket.
+    """
+    reference = {}
+    quantiles = [i / bins for i in range(1, bins)]
+    for feature in X.columns:
+        edges = sorted(set(float(v) for v in X[feature].quantile(quantiles)))
+        hist = StreamingHistogram(edges)
+        for value in X[feature]:
+            hist.update(value)
+        reference[feature] = {"edges": edges, "proportions": hist.proportions()}
+    return reference
+
+
+def save_reference(reference, path=REFERENCE_PATH):
+    Path(path).write_text(json.dumps(reference, indent=2))
+
+
+if __name__ == "__main__":
+    # Rebuild the reference for the current dataset without retraining
+    from ml.train import features, load_dataset
+
+    save_reference(build_reference(load_dataset()[features]))
+    print(f"Drift reference saved to {REFERENCE_PATH}")
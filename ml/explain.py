@@ -0,0 +1,131 @@
+import numpy as np
+
+
+class PathAttributor:
+    """
+    Exact tree-path (Saabas) attributions for a fitted tree ensemble.
+
+    Walking a sample down a tree, each split moves the node's class
+    distribution from the parent's to the child's; that change is
+    credited to the split feature. Summed over the path and averaged
+    over trees this decomposes the prediction exactly:
+
+        predict_proba(x) == bias + contributions(x).sum(axis=features)
+
+    Every node's cumulative path contribution is precomputed once, so
+    scoring is a leaf lookup per tree and a gather-sum; the same pass
+    also yields the class probabilities. All trees are flattened into
+    plain arrays, so a saved attributor scores without scikit-learn.
+    """
+
+    ARRAYS = ("feature", "threshold", "left", "right", "roots", "table", "bias")
+
+    def __init__(self, feature, threshold, left, right, roots, table, bias):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.roots = roots
+        self.table = table
+        self.bias = bias
+        self.n_classes = len(bias)
+        self.n_features = table.shape[1] // self.n_classes
+        self.depth = self._max_depth()
+
+    @classmethod
+    def from_model(cls, model):
+        estimators = getattr(model, "estimators_", None) or [model]
+        n_features = model.n_features_in_
+        n_classes = len(model.classes_)
+
+        parts = {name: [] for name in ("feature", "threshold", "left", "right", "table")}
+        roots, bias, offset = [], np.zeros(n_classes), 0
+        for est in estimators:
+            tree = est.tree_
+            proba = cls._node_proba(tree)
+            is_leaf = tree.children_left < 0
+            parts["feature"].append(np.where(is_leaf, 0, tree.feature))
+            parts["threshold"].append(tree.threshold)
+            # Leaves point at themselves so traversal can run a fixed depth
+            own = np.arange(tree.node_count) + offset
+            parts["left"].append(np.where(is_leaf, own, tree.children_left + offset))
+            parts["right"].append(np.where(is_leaf, own, tree.children_right + offset))
+            parts["table"].append(cls._path_table(tree, proba, n_features, n_classes))
+            roots.append(offset)
+            bias += proba[0]
+            offset += tree.node_count
+
+        n_trees = len(estimators)
+        arrays = {name: np.concatenate(values) for name, values in parts.items()}
+        return cls(
+            feature=arrays["feature"],
+            threshold=arrays["threshold"],
+            left=arrays["left"],
+            right=arrays["right"],
+            roots=np.array(roots),
+            table=arrays["table"] / n_trees,
+            bias=bias / n_trees,
+        )
+
+    @staticmethod
+    def _node_proba(tree):
+        value = tree.value[:, 0, :]
+        return value / value.sum(axis=1, keepdims=True)
+
+    @staticmethod
+    def _path_table(tree, proba, n_features, n_classes):
+        """
+        Per node, the summed (feature, class) contributions of the splits
+        on the path from the root to that node.
+        """
+        n_nodes = tree.node_count
+        parent = np.full(n_nodes, -1)
+        for children in (tree.children_left, tree.children_right):
+            has_child = children >= 0
+            parent[children[has_child]] = np.nonzero(has_child)[0]
+
+        depth = np.zeros(n_nodes, dtype=int)
+        for node in range(1, n_nodes):  # preorder: parents come first
+            depth[node] = depth[parent[node]] + 1
+
+        table = np.zeros((n_nodes, n_features, n_classes))
+        for level in range(1, depth.max() + 1):
+            nodes = np.nonzero(depth == level)[0]
+            parents = parent[nodes]
+            table[nodes] = table[parents]
+            table[nodes, tree.feature[parents]] += proba[nodes] - proba[parents]
+        return table.reshape(n_nodes, -1)
+
+    def _max_depth(self):
+        nodes, depth = self.roots, 0
+        while True:
+            children = np.concatenate([self.left[nodes], self.right[nodes]])
+            children = children[children != np.concatenate([nodes, nodes])]
+            if not len(children):
+                return depth
+            nodes, depth = children, depth + 1
+
+    def leaves(self, X):
+        """
+        Leaf index of every row in every tree, shape (rows, trees).
+        Matches scikit-learn, which compares float32 inputs to thresholds.
+        """
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        rows = np.arange(len(X))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+        for _ in range(self.depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def explain(self, X):
+        """
+        (probabilities, contributions) for the scaled feature matrix X.
+        contributions has shape (rows, features, classes).
+        """
+        rows = self.table[self.leaves(X)].sum(axis=1)
+        contributions = rows.reshape(len(X), self.n_features, self.n_classes)
+        return self.bias + contributions.sum(axis=1), contributions
+
+    def arrays(self):
+        return {name: getattr(self, name) for name in self.ARRAYS}
@@ -1,34 +1,149 @@
-import joblib, pandas as pd
+import os
+from functools import lru_cache
 from pathlib import Path
+import numpy as np
 from ml.utils import engagement_score, cognitive_load
+from ml.explain import PathAttributor
 
 BASE = Path(__file__).resolve().parent.parent
 MODEL_DIR = BASE / "backend" / "models"
+SNAPSHOT_PATH = MODEL_DIR / "serving_snapshot.npz"
 
-model = joblib.load(MODEL_DIR / "burnout_model.pkl")
-scaler = joblib.load(MODEL_DIR / "scaler.pkl")
-encoder = joblib.load(MODEL_DIR / "label_encoder.pkl")
+FEATURES = [
+    "study_hours","screen_time_hours","sleep_hours",
+    "self_reported_stress","sentiment_score",
+    "engagement_score","cognitive_load_score"
+]
 
-def predict_burnout(data):
-    df = pd.DataFrame([data])
-    df["engagement_score"] = engagement_score(
-        df.study_hours[0],
-        df.engagement_level[0],
-        df.assignment_deadline_missed[0]
+# Recommendations are ranked by what drives this class
+RISK_CLASS = "High"
+
+class ServingArtifacts:
+    """
+    Everything predictions need: scaler statistics, class names and
+    either a path attributor (tree models) or the fitted model.
+    """
+
+    def __init__(self, mean, scale, classes, attributor=None, model=None):
+        self.mean = mean
+        self.scale = scale
+        self.classes = classes
+        self.attributor = attributor
+        self.model = model
+
+def _load_pickles():
+    import joblib  # deferred: unpickling pulls in scikit-learn
+
+    # Set BURNOUT_MODEL_FILE to serve a distilled student (see ml/distill.py)
+    model = joblib.load(MODEL_DIR / os.getenv("BURNOUT_MODEL_FILE", "burnout_model.pkl"))
+    scaler = joblib.load(MODEL_DIR / "scaler.pkl")
+    encoder = joblib.load(MODEL_DIR / "label_encoder.pkl")
+
+    # Tree models are scored through their path attributions, which give
+    # the same probabilities plus per-feature contributions
+    is_tree = hasattr(model, "estimators_") or hasattr(model, "tree_")
+    attributor = PathAttributor.from_model(model) if is_tree else None
+    return ServingArtifacts(
+        scaler.mean_, scaler.scale_, encoder.classes_.astype(str), attributor, model
+    )
+
+def _load_snapshot(path):
+    with np.load(path, allow_pickle=False) as data:
+        arrays = dict(data)
+    return ServingArtifacts(
+        arrays.pop("mean"), arrays.pop("scale"), arrays.pop("classes"),
+        PathAttributor(**arrays)
     )
-    df["cognitive_load_score"] = cognitive_load(
-        df.assignments_pending[0],
-        df.upcoming_deadline_load[0]
+
+@lru_cache(maxsize=None)
+def artifacts():
+    """
+    Serving artifacts, loaded on first use. With BURNOUT_USE_SNAPSHOT=1
+    they come from the numpy snapshot written by ml/snapshot.py, which
+    loads without joblib or scikit-learn.
+    """
+    if os.getenv("BURNOUT_USE_SNAPSHOT") == "1" and SNAPSHOT_PATH.exists():
+        return _load_snapshot(SNAPSHOT_PATH)
+    return _load_pickles()
+
+def save_snapshot(path=SNAPSHOT_PATH):
+    loaded = _load_pickles()
+    if loaded.attributor is None:
+        raise ValueError("Snapshots are only supported for tree models")
+    np.savez(
+        path, mean=loaded.mean, scale=loaded.scale, classes=loaded.classes,
+        **loaded.attributor.arrays()
     )
 
-    X = scaler.transform(df[[
-        "study_hours","screen_time_hours","sleep_hours",
-        "self_reported_stress","sentiment_score",
-        "engagement_score","cognitive_load_score"
-    ]])
-
-    proba = model.predict_proba(X)[0]
-    idx = proba.argmax()
-    label = encoder.inverse_transform([idx])[0]
-    score = int(proba[idx] * 100)
-    return score, label
+def feature_row(data):
+    """
+    The unscaled model features for one check-in, in FEATURES order.
+    """
+    return [
+        data["study_hours"],
+        data["screen_time_hours"],
+        data["sleep_hours"],
+        data["self_reported_stress"],
+        data["sentiment_score"],
+        engagement_score(
+            data["study_hours"],
+            data["engagement_level"],
+            data["assignment_deadline_missed"]
+        ),
+        cognitive_load(
+            data["assignments_pending"],
+            data["upcoming_deadline_load"]
+        ),
+    ]
+
+def _feature_matrix(rows):
+    loaded = artifacts()
+    X = np.array([feature_row(r) for r in rows], dtype=float)
+    return (X - loaded.mean) / loaded.scale
+
+def _label_and_score(proba):
+    idx = proba.argmax(axis=1)
+    labels = artifacts().classes[idx]
+    scores = (proba[range(len(idx)), idx] * 100).astype(int)
+    return idx, scores.tolist(), labels.tolist()
+
+def predict_burnout_batch(rows):
+    X = _feature_matrix(rows)
+    loaded = artifacts()
+    if loaded.attributor:
+        proba = loaded.attributor.explain(X)[0]
+    else:
+        proba = loaded.model.predict_proba(X)
+    _, scores, labels = _label_and_score(proba)
+    return list(zip(scores, labels))
+
+def predict_burnout(data):
+    return predict_burnout_batch([data])[0]
+
+def explain_burnout_batch(rows, top_k=None):
+    """
+    (score, label, factors, risk_factors) per row. factors are (feature,
+    contribution) pairs towards the predicted class, strongest first
+    (the top_k strongest if given); risk_factors are the same towards
+    RISK_CLASS, whatever was predicted. Both are empty for models
+    without tree-path attributions.
+    """
+    attributor = artifacts().attributor
+    if attributor is None:
+        return [(score, label, [], []) for score, label in predict_burnout_batch(rows)]
+
+    proba, contributions = attributor.explain(_feature_matrix(rows))
+    idx, scores, labels = _label_and_score(proba)
+    risk = list(artifacts().classes).index(RISK_CLASS)
+
+    def ranked(towards):
+        top = towards.argsort()[::-1][:top_k]
+        return [(FEATURES[f], float(towards[f])) for f in top]
+
+    return [
+        (scores[row], labels[row], ranked(contributions[row, :, cls]), ranked(contributions[row, :, risk]))
+        for row, cls in enumerate(idx)
+    ]
+
+def explain_burnout(data, top_k=None):
+    return explain_burnout_batch([data], top_k)[0]
@@ -0,0 +1,101 @@
+import json
+
+WINDOW = 30
+SHORT_WINDOW = 7
+SLEEP_TARGET_HOURS = 8.0
+
+ROLLING_FEATURES = [
+    "stress_mean_7d",
+    "stress_mean_30d",
+    "sleep_debt_7d",
+    "sleep_debt_30d",
+    "missed_deadline_streak",
+]
+
+
+class RollingState:
+    """
+    One user's last 30 days of check-ins in a fixed ring buffer.
+
+    Day d lives in slot d % 30, so recording a check-in overwrites at most
+    one slot and features are read from at most 30 slots: constant work
+    per check-in, with no query over past rows. Each slot remembers its
+    day, so slots left over from earlier cycles are simply ignored, and a
+    second check-in on the same day replaces the first.
+    """
+
+    def __init__(self, days=None, stress=None, sleep=None, missed=None):
+        self.days = list(days or [0] * WINDOW)
+        self.stress = list(stress or [0.0] * WINDOW)
+        self.sleep = list(sleep or [0.0] * WINDOW)
+        self.missed = list(missed or [0] * WINDOW)
+
+    def add(self, day, data):
+        """Record a check-in dict for `day` (a date)."""
+        d = day.toordinal()
+        slot = d % WINDOW
+        self.days[slot] = d
+        self.stress[slot] = float(data["self_reported_stress"])
+        self.sleep[slot] = float(data["sleep_hours"])
+        self.missed[slot] = int(data["assignment_deadline_missed"] > 0)
+
+    def _window(self, d, length):
+        return [
+            slot for slot in range(WINDOW)
+            if self.days[slot] and d - length < self.days[slot] <= d
+        ]
+
+    def features(self, day):
+        """
+        ROLLING_FEATURES as of `day`, counting check-ins up to and
+        including that day. Sleep debt sums max(0, 8 - sleep_hours);
+        the streak counts consecutive days, ending on `day`, that had a
+        check-in with a missed deadline.
+        """
+        d = day.toordinal()
+        values = {}
+        for length, suffix in ((SHORT_WINDOW, "7d"), (WINDOW, "30d")):
+            slots = self._window(d, length)
+            stress = [self.stress[s] for s in slots]
+            values[f"stress_mean_{suffix}"] = sum(stress) / len(stress) if stress else 0.0
+            values[f"sleep_debt_{suffix}"] = sum(
+                max(0.0, SLEEP_TARGET_HOURS - self.sleep[s]) for s in slots
+            )
+
+        streak = 0
+        while streak < WINDOW:
+            slot = (d - streak) % WINDOW
+            if self.days[slot] != d - streak or not self.missed[slot]:
+                break
+            streak += 1
+        values["missed_deadline_streak"] = streak
+        return [values[name] for name in ROLLING_FEATURES]
+
+    def to_json(self):
+        return json.dumps({"d": self.days, "s": self.stress, "h": self.sleep, "m": self.missed})
+
+    @classmethod
+    def from_json(cls, text):
+        if not text:
+            return cls()
+        data = json.loads(text)
+        return cls(data["d"], data["s"], data["h"], data["m"])
+
+
+def rolling_frame(df):
+    """
+    ROLLING_FEATURES for every row of a check-in DataFrame (user_id,
+    date, ...), computed by replaying each user's rows in date order
+    through RollingState, exactly as they accumulate when served.
+    """
+    import pandas as pd  # training-time only
+
+    dates = pd.to_datetime(df["date"]).dt.date
+    states = {}
+    rows = {}
+    for index in sorted(df.index, key=lambda i: (dates[i], i)):
+        record = df.loc[index]
+        state = states.setdefault(record["user_id"], RollingState())
+        state.add(dates[index], record)
+        rows[index] = state.features(dates[index])
+    return pd.DataFrame.from_dict(rows, orient="index", columns=ROLLING_FEATURES).loc[df.index]
@@ -0,0 +1,13 @@
+import sys
+from pathlib import Path
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent
+sys.path.append(str(project_root))
+from ml.predict import SNAPSHOT_PATH, save_snapshot
+
+# Flatten the served model, scaler and label encoder into one numpy
+# archive that the API loads with BURNOUT_USE_SNAPSHOT=1. Rebuild it
+# whenever the pickled artifacts change.
+if __name__ == "__main__":
+    save_snapshot()
+    print(f"Serving snapshot saved to {SNAPSHOT_PATH}")
@@ -1,43 +1,25 @@
 import sys
 import os
+import time
+import argparse
 from pathlib import Path
 current_file = Path(__file__).resolve()
 project_root = current_file.parent.parent
 sys.path.append(str(project_root))
+import numpy as np
 import pandas as pd
 import joblib
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import classification_report
-from src.utils import engagement_score, cognitive_load  
+from sklearn.metrics import accuracy_score, classification_report, f1_score, log_loss
+from ml.utils import engagement_score, cognitive_load
+from ml.drift import build_reference, save_reference
+from ml.rolling import ROLLING_FEATURES, RollingState, rolling_frame
 
 # Define paths
 DATA_PATH = project_root / "data" / "student_burnout_synthetic.csv"
-MODEL_DIR = project_root / "models"
-MODEL_DIR.mkdir(exist_ok=True) # Create folder if it doesn't exist
-
-# Load dataset
-df = pd.read_csv(DATA_PATH)
-
-# Load dataset
-df = pd.read_csv("data/student_burnout_synthetic.csv")
-
-# Feature engineering
-df["engagement_score"] = df.apply(
-    lambda x: engagement_score(
-        x["study_hours"],
-        x["class_attendance_rate"],
-        x["assignment_deadline_missed"]
-    ), axis=1
-)
-
-df["cognitive_load_score"] = df.apply(
-    lambda x: cognitive_load(
-        x["assignments_pending"],
-        x["upcoming_deadline_load"]
-    ), axis=1
-)
+MODEL_DIR = project_root / "backend" / "models"
 
 features = [
     "study_hours",
@@ -49,36 +31,161 @@ features = [
     "cognitive_load_score"
 ]
 
-X = df[features]
-y = df["burnout_risk_label"]
 
-# Encode labels
-label_encoder = LabelEncoder()
-y_enc = label_encoder.fit_transform(y)
+def load_dataset():
+    """
+    Load the synthetic dataset and add the engineered features.
+    """
+    df = pd.read_csv(DATA_PATH)
 
-# Scale features
-scaler = StandardScaler()
-X_scaled = scaler.fit_transform(X)
+    # Feature engineering
+    df["engagement_score"] = df.apply(
+        lambda x: engagement_score(
+            x["study_hours"],
+            x["class_attendance_rate"],
+            x["assignment_deadline_missed"]
+        ), axis=1
+    )
 
-# Split
-X_train, X_test, y_train, y_test = train_test_split(
-    X_scaled, y_enc, test_size=0.2, stratify=y_enc, random_state=42
-)
+    df["cognitive_load_score"] = df.apply(
+        lambda x: cognitive_load(
+            x["assignments_pending"],
+            x["upcoming_deadline_load"]
+        ), axis=1
+    )
 
-# Train model
-model = RandomForestClassifier(
-    n_estimators=200,
-    max_depth=10,
-    random_state=42
-)
-model.fit(X_train, y_train)
+    return df
 
-# Evaluate
-print(classification_report(y_test, model.predict(X_test)))
 
-# Save artifacts
-joblib.dump(model, MODEL_DIR / "burnout_model.pkl")
-joblib.dump(scaler, MODEL_DIR / "scaler.pkl")
-joblib.dump(label_encoder, MODEL_DIR / "label_encoder.pkl")
+def split_dataset(X_scaled, y_enc):
+    """
+    The train/test split used by every training and evaluation script.
+    """
+    return train_test_split(
+        X_scaled, y_enc, test_size=0.2, stratify=y_enc, random_state=42
+    )
 
-print("Model trained and saved successfully.")
+
+def fit_forest(X_train, y_train):
+    model = RandomForestClassifier(
+        n_estimators=200,
+        max_depth=10,
+        random_state=42
+    )
+    model.fit(X_train, y_train)
+    return model
+
+
+def serving_latency_ms(model, scaler, rows, rolling, repeats=200):
+    """
+    Median time to score one check-in dict the way the API does. The
+    rolling variant also pays for decoding the user's stored state,
+    adding today's check-in and reading its window features. Storage is
+    excluded: the read-for-update and upsert of user_rolling_features on
+    every check-in are measured by bench/rolling_store.py.
+    """
+    from ml.explain import PathAttributor
+    from ml.predict import feature_row
+
+    attributor = PathAttributor.from_model(model)
+    stored = RollingState().to_json()
+    day = pd.Timestamp.today().date()
+
+    def score(data):
+        row = feature_row(data)
+        if rolling:
+            state = RollingState.from_json(stored)
+            state.add(day, data)
+            row += state.features(day)
+        attributor.explain((np.array([row]) - scaler.mean_) / scaler.scale_)
+
+    timings = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        score(rows[i % len(rows)])
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def evaluate_rolling(df, y_enc, label_encoder):
+    """
+    Train today's model and the rolling-window variant on the same split
+    and compare accuracy and single check-in serving latency. Saves the
+    variant as burnout_model_rolling.pkl / scaler_rolling.pkl.
+    """
+    rolling_features = features + ROLLING_FEATURES
+    df = df.join(rolling_frame(df))
+    rows = df.rename(columns={"class_attendance_rate": "engagement_level"}).to_dict("records")
+
+    results = {}
+    for name, columns in (("current", features), ("rolling", rolling_features)):
+        scaler = StandardScaler()
+        X_train, X_test, y_train, y_test = split_dataset(scaler.fit_transform(df[columns]), y_enc)
+        model = fit_forest(X_train, y_train)
+        predicted = model.predict(X_test)
+        print(f"--- {name} ({len(columns)} features) ---")
+        print(classification_report(y_test, predicted, target_names=label_encoder.classes_))
+        results[name] = (
+            accuracy_score(y_test, predicted),
+            f1_score(y_test, predicted, average="macro"),
+            log_loss(y_test, model.predict_proba(X_test)),
+            serving_latency_ms(model, scaler, rows, rolling=name == "rolling"),
+            model,
+            scaler,
+        )
+
+    print(f"{'model':<10}{'accuracy':>10}{'macro_f1':>10}{'log_loss':>10}{'serve_ms':>10}")
+    for name, (accuracy, macro_f1, loss, latency, _, _) in results.items():
+        print(f"{name:<10}{accuracy:>10.3f}{macro_f1:>10.3f}{loss:>10.4f}{latency:>10.3f}")
+    print("serve_ms excludes storage; the rolling variant also reads and upserts "
+          "user_rolling_features per check-in (python bench/rolling_store.py)")
+
+    *_, model, scaler = results["rolling"]
+    joblib.dump(model, MODEL_DIR / "burnout_model_rolling.pkl")
+    joblib.dump(scaler, MODEL_DIR / "scaler_rolling.pkl")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--rolling", action="store_true",
+        help="train and compare the variant with 7/30-day rolling features"
+    )
+    args = parser.parse_args()
+
+    MODEL_DIR.mkdir(exist_ok=True) # Create folder if it doesn't exist
+
+    # Load dataset
+    df = load_dataset()
+
+    X = df[features]
+    y = df["burnout_risk_label"]
+
+    # Encode labels
+    label_encoder = LabelEncoder()
+    y_enc = label_encoder.fit_transform(y)
+
+    if args.rolling:
+        evaluate_rolling(df, y_enc, label_encoder)
+        sys.exit()
+
+    # Scale features
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(X)
+
+    # Split
+    X_train, X_test, y_train, y_test = split_dataset(X_scaled, y_enc)
+
+    # Train model
+    model = fit_forest(X_train, y_train)
+
+    # Evaluate
+    print(classification_report(y_test, model.predict(X_test)))
+
+    # Save artifacts
+    joblib.dump(model, MODEL_DIR / "burnout_model.pkl")
+    joblib.dump(scaler, MODEL_DIR / "scaler.pkl")
+    joblib.dump(label_encoder, MODEL_DIR / "label_encoder.pkl")
+    save_reference(build_reference(X))
+
+    print("Model trained and saved successfully.")
@@ -26,26 +26,37 @@ def cognitive_load(assignments_pending, upcoming_deadline_load):
     return min(10, load)
 
 
-def get_risk_recommendations(label, data):
+def get_risk_recommendations(label, data, factors=None):
     """
-    Rule-based, ethical recommendations
+    Rule-based, ethical recommendations.
+    When model attributions towards High risk are given as (feature,
+    contribution) pairs, the triggered recommendations are ordered by
+    how much their feature pushed towards High, whatever the predicted
+    label (for a Low prediction, the factors behind Low are the
+    protective ones).
     """
     recs = []
 
     if data["sleep_hours"] < 6:
-        recs.append("😴 Sleep is critically low. Aim for 7–9 hours tonight.")
+        recs.append(("sleep_hours", "😴 Sleep is critically low. Aim for 7–9 hours tonight."))
 
     if data["screen_time_hours"] > 10:
-        recs.append("📱 High screen time detected. Reduce screen exposure before bed.")
+        recs.append(("screen_time_hours", "📱 High screen time detected. Reduce screen exposure before bed."))
 
     if data["self_reported_stress"] >= 8:
-        recs.append("🧘 High stress detected. Consider breathing exercises or talking to someone.")
+        recs.append(("self_reported_stress", "🧘 High stress detected. Consider breathing exercises or talking to someone."))
 
     if data["assignments_pending"] >= 4:
-        recs.append("📝 Break pending tasks into smaller steps.")
+        recs.append(("cognitive_load_score", "📝 Break pending tasks into smaller steps."))
 
     if data["engagement_level"] < 0.6:
-        recs.append("🎯 Low engagement today. Reflect on blockers or distractions.")
+        recs.append(("engagement_score", "🎯 Low engagement today. Reflect on blockers or distractions."))
+
+    if factors:
+        weight = dict(factors)
+        recs.sort(key=lambda rec: weight.get(rec[0], float("-inf")), reverse=True)
+
+    recs = [message for _, message in recs]
 
     if label == "High":
         recs.append("🆘 Consider reaching out to a trusted person or support service.")
@@ -0,0 +1,219 @@
+# ============================================================
+# streamlit_admin/api_client.py
+# Shared backend client for the Streamlit apps
+# ============================================================
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_TIMEOUT = (3.05, 10)   # (connect, read) seconds
+RETRY_STATUSES = (502, 503, 504)
+
+# ============================================================
+# RESPONSE MODELS (mirror backend/app/schemas.py)
+# ============================================================
+
+@dataclass
+class CheckoutResult:
+    score: int
+    label: str
+    top_factors: List[dict] = field(default_factory=list)
+    recommendations: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(
+            score=int(data["score"]),
+            label=data["label"],
+            top_factors=data.get("top_factors", []),
+            recommendations=data.get("recommendations", []),
+        )
+
+
+@dataclass
+class HistoryPage:
+    items: pd.DataFrame
+    next_before: Optional[str]
+
+
+@dataclass
+class OrgSummary:
+    participation_rate: Optional[float]
+    avg_stress: Optional[float]
+    avg_sleep: Optional[float]
+    high_risk_pct: Optional[float]
+    total_checkouts: int
+    alerts: List[str]
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(
+            participation_rate=data["participation_rate"],
+            avg_stress=data["avg_stress"],
+            avg_sleep=data["avg_sleep"],
+            high_risk_pct=data["high_risk_pct"],
+            total_checkouts=int(data["total_checkouts"]),
+            alerts=list(data["alerts"]),
+        )
+
+
+@dataclass
+class DashboardFutures:
+    """In-flight dashboard requests; call .result() in render order."""
+    summary: Future
+    departments: Future
+
+# ============================================================
+# CLIENT
+# ============================================================
+
+class BurnoutAPIClient:
+    """
+    One keep-alive connection pool per process. Every call has a
+    timeout; connection errors and 502/503/504 are retried with
+    exponential backoff (honouring Retry-After). POST /checkout is an
+    upsert on (user, date), so retrying it is safe.
+    """
+
+    def __init__(self, base_url, timeout=DEFAULT_TIMEOUT, retries=3,
+                 backoff=0.3, pool_size=10, max_workers=4):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "POST"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def _get(self, path, headers=None, **params):
+        r = self.session.get(f"{self.base_url}{path}", params=params, headers=headers, timeout=self.timeout)
+        r.raise_for_status()
+        return r.json()
+
+    def _post(self, path, payload):
+        r = self.session.post(f"{self.base_url}{path}", json=payload, timeout=self.timeout)
+        r.raise_for_status()
+        return r.json()
+
+    # ---------------- employee app ----------------
+
+    def checkout(self, payload) -> CheckoutResult:
+        return CheckoutResult.from_json(self._post("/checkout", payload))
+
+    def checkout_batch(self, payloads) -> List[CheckoutResult]:
+        return [CheckoutResult.from_json(r) for r in self._post("/checkout/batch", payloads)]
+
+    def history(self, email, before=None, limit=30) -> HistoryPage:
+        data = self._get("/user/history", headers={"X-User-Email": email}, before=before, limit=limit)
+        return HistoryPage(items=pd.DataFrame(data["items"]), next_before=data["next_before"])
+
+    # ---------------- dashboard ----------------
+
+    def department_aggregates(self, start, end) -> pd.DataFrame:
+        return pd.DataFrame(self._get("/dept/aggregates", start=start, end=end))
+
+    def org_aggregates(self, start, end) -> pd.DataFrame:
+        return pd.DataFrame(self._get("/org/aggregates", start=start, end=end))
+
+    def org_summary(self, start, end, departments=None) -> OrgSummary:
+        return OrgSummary.from_json(
+            self._get("/org/summary", start=start, end=end, departments=departments)
+        )
+
+    def workload_sleep_bins(self, start, end, bins=20, departments=None) -> pd.DataFrame:
+        return pd.DataFrame(self._get(
+            "/dept/workload-sleep-bins",
+            start=start, end=end, bins=bins, departments=departments
+        ))
+
+    def department_quantiles(self, start, end, departments=None, quantiles=(0.5, 0.9)):
+        return self._get(
+            "/dept/quantiles",
+            start=start, end=end, departments=departments, q=list(quantiles)
+        )
+
+    def prefetch_dashboard(self, start, end, departments=None) -> DashboardFutures:
+        """Issue the summary and department requests concurrently."""
+        return DashboardFutures(
+            summary=self._executor.submit(self.org_summary, start, end, departments),
+            departments=self._executor.submit(self.department_aggregates, start, end),
+        )
+
+# ============================================================
+# CLIENT-SIDE CHECK-IN BATCHING
+# ============================================================
+
+class CheckoutBatcher:
+    """
+    Buffers check-ins and sends them through POST /checkout/batch once
+    `max_batch` are queued or `max_delay` seconds have passed since the
+    first one. submit() returns a Future resolving to a CheckoutResult.
+    """
+
+    def __init__(self, client, max_batch=50, max_delay=1.0):
+        self.client = client
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._pending = []
+        self._timer = None
+
+    def submit(self, payload) -> Future:
+        future = Future()
+        with self._lock:
+            self._pending.append((payload, future))
+            if len(self._pending) >= self.max_batch:
+                batch = self._take()
+            else:
+                batch = None
+                if self._timer is None:
+                    self._timer = threading.Timer(self.max_delay, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+        if batch:
+            self._send(batch)
+        return future
+
+    def flush(self):
+        with self._lock:
+            batch = self._take()
+        if batch:
+            self._send(batch)
+
+    def _take(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        return batch
+
+    def _send(self, batch):
+        try:
+            results = self.client.checkout_batch([payload for payload, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
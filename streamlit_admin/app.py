@@ -8,14 +8,19 @@ import plotly.graph_objects as go
 import pandas as pd
 from datetime import datetime
 import requests
+from api_client import BurnoutAPIClient
 
 # ============================================================
 # CONFIG
 # ============================================================
 
 API_BASE = "https://your-render-url"   # <-- CHANGE THIS
-CHECKOUT_ENDPOINT = f"{API_BASE}/checkout"
-HISTORY_ENDPOINT = f"{API_BASE}/user/history"
+
+@st.cache_resource
+def get_client():
+    return BurnoutAPIClient(API_BASE)
+
+client = get_client()
 
 # ============================================================
 # SESSION STATE
@@ -211,7 +216,7 @@ st.markdown('</div>', unsafe_allow_html=True)
 
 if st.button("✅ Complete Daily Checkout", use_container_width=True):
     payload = {
-        "user_email": st.session_state.user_email,
+        "email": st.session_state.user_email,
         "department": st.session_state.user_department,
         "study_hours": study_hours,
         "sleep_hours": sleep_hours,
@@ -225,13 +230,15 @@ if st.button("✅ Complete Daily Checkout", use_container_width=True):
         "reflection": reflection
     }
 
-    with st.spinner("Processing checkout..."):
-        res = requests.post(CHECKOUT_ENDPOINT, json=payload)
+    try:
+        with st.spinner("Processing checkout..."):
+            result = client.checkout(payload)
+    except requests.RequestException:
+        result = None
 
-    if res.status_code == 200:
-        data = res.json()
-        score = data["burnout_score"]
-        label = data["risk_label"]
+    if result is not None:
+        score = result.score
+        label = result.label
 
         st.success("✅ Checkout complete!")
         st.session_state.checkout_count += 1
@@ -243,9 +250,30 @@ if st.button("✅ Complete Daily Checkout", use_container_width=True):
         ))
         st.plotly_chart(fig, use_container_width=True)
 
+        for rec in result.recommendations:
+            st.info(rec)
+
     else:
         st.error("❌ API Error. Please check backend.")
 
+# ============================================================
+# TREND (ONE HISTORY PAGE — ROLLING AVERAGES COMPUTED SERVER-SIDE)
+# ============================================================
+
+try:
+    history = client.history(st.session_state.user_email, limit=30).items
+except requests.RequestException:
+    history = pd.DataFrame()
+
+if not history.empty:
+    st.markdown('<p class="quick-question">📈 Your Stress Trend</p>', unsafe_allow_html=True)
+    history = history.sort_values("date")
+    fig = go.Figure()
+    fig.add_scatter(x=history["date"], y=history["stress_7d"], name="7-day avg")
+    fig.add_scatter(x=history["date"], y=history["stress_30d"], name="30-day avg")
+    fig.update_layout(template="plotly_dark", yaxis=dict(range=[0, 10]))
+    st.plotly_chart(fig, use_container_width=True)
+
 # ============================================================
 # FOOTER
 # ============================================================
@@ -10,14 +10,19 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import requests
+from api_client import BurnoutAPIClient, OrgSummary
 
 # ============================================================
 # CONFIG
 # ============================================================
 
 API_BASE = "https://your-render-url"   # 🔴 CHANGE THIS
-DEPT_ENDPOINT = f"{API_BASE}/dept/aggregates"
-ORG_ENDPOINT = f"{API_BASE}/org/aggregates"
+
+@st.cache_resource
+def get_client():
+    return BurnoutAPIClient(API_BASE)
+
+client = get_client()
 
 # ============================================================
 # PAGE CONFIG
@@ -105,30 +110,54 @@ section[data-testid="stSidebar"] {
 # DATA LOADING HELPERS
 # ============================================================
 
-def load_department_data(start_date, end_date):
+def result_or(future, default):
     try:
-        r = requests.get(
-            DEPT_ENDPOINT,
-            params={"start": start_date, "end": end_date},
-            timeout=10
-        )
-        r.raise_for_status()
-        return pd.DataFrame(r.json())
-    except Exception:
-        return pd.DataFrame()
+        return future.result()
+    except requests.RequestException:
+        return default
 
-def load_org_data(start_date, end_date):
+def load_workload_bins(start_date, end_date, bins, departments=None):
     try:
-        r = requests.get(
-            ORG_ENDPOINT,
-            params={"start": start_date, "end": end_date},
-            timeout=10
-        )
-        r.raise_for_status()
-        return pd.DataFrame(r.json())
-    except Exception:
+        return client.workload_sleep_bins(start_date, end_date, bins, departments)
+    except requests.RequestException:
         return pd.DataFrame()
 
+def bin_locally(df, bins):
+    """Fallback for demo data: same binning as /dept/workload-sleep-bins."""
+    df = df.assign(
+        x_bin=pd.cut(df["avg_workload"], bins, labels=False),
+        y_bin=pd.cut(df["avg_sleep"], bins, labels=False),
+        weighted_stress=df["avg_stress"] * df["total_checkouts"]
+    )
+    grouped = df.groupby(["x_bin", "y_bin"])
+    out = grouped.agg(
+        avg_workload=("avg_workload", "mean"),
+        avg_sleep=("avg_sleep", "mean"),
+        weighted_stress=("weighted_stress", "sum"),
+        total_checkouts=("total_checkouts", "sum"),
+        rows=("avg_stress", "size")
+    ).reset_index()
+    out["avg_stress"] = out["weighted_stress"] / out["total_checkouts"]
+    return out
+
+def summarize_locally(df):
+    """Fallback for demo data: same KPIs as /org/summary, weighted by checkouts."""
+    week = df[df["date"] >= df["date"].max() - pd.Timedelta(days=7)]
+    weights = week["total_checkouts"]
+    summary = OrgSummary(
+        participation_rate=np.average(week["participation_rate"], weights=weights),
+        avg_stress=np.average(week["avg_stress"], weights=weights),
+        avg_sleep=np.average(week["avg_sleep"], weights=weights),
+        high_risk_pct=np.average(week["risk_high_pct"], weights=weights),
+        total_checkouts=int(weights.sum()),
+        alerts=[]
+    )
+    if summary.avg_stress > 7.5:
+        summary.alerts.append("elevated_stress")
+    if summary.avg_sleep < 6.5:
+        summary.alerts.append("sleep_deficit")
+    return summary
+
 def generate_fallback_data():
     dates = pd.date_range(end=datetime.now(), periods=30)
     depts = ["Engineering", "Marketing", "Sales", "Operations", "HR", "Finance"]
@@ -167,30 +196,6 @@ date_range = st.sidebar.date_input(
 
 start_date, end_date = date_range
 
-# ============================================================
-# LOAD DATA
-# ============================================================
-
-df = load_department_data(start_date, end_date)
-
-if df.empty:
-    st.warning("📊 No live data available — showing demo data.")
-    df = generate_fallback_data()
-
-df["date"] = pd.to_datetime(df["date"])
-
-# ============================================================
-# DEPARTMENT FILTER
-# ============================================================
-
-selected_depts = st.sidebar.multiselect(
-    "Departments",
-    options=sorted(df["department"].unique()),
-    default=sorted(df["department"].unique())
-)
-
-df = df[df["department"].isin(selected_depts)]
-
 # ============================================================
 # HEADER
 # ============================================================
@@ -203,12 +208,24 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ============================================================
-# KPIs (LAST 7 DAYS)
+# KPIs & ALERTS (LAST 7 DAYS) — rendered from /org/summary
+# before the heavier chart data is fetched
 # ============================================================
 
-df_week = df[df["date"] >= df["date"].max() - pd.Timedelta(days=7)]
-
-col1, col2, col3, col4, col5 = st.columns(5)
+ALERT_BOXES = {
+    "elevated_stress": """
+    <div class="alert-box">
+        🚨 <strong>Elevated Stress Detected</strong><br>
+        Organization-wide stress levels are critically high.
+    </div>
+    """,
+    "sleep_deficit": """
+    <div class="alert-box">
+        😴 <strong>Sleep Deficit Warning</strong><br>
+        Average sleep below healthy range.
+    </div>
+    """,
+}
 
 def kpi(card_col, value, label):
     with card_col:
@@ -219,33 +236,59 @@ def kpi(card_col, value, label):
         </div>
         """, unsafe_allow_html=True)
 
-kpi(col1, f"{df_week['participation_rate'].mean():.0%}", "Participation")
-kpi(col2, f"{df_week['avg_stress'].mean():.1f}/10", "Avg Stress")
-kpi(col3, f"{df_week['avg_sleep'].mean():.1f}h", "Avg Sleep")
-kpi(col4, f"{df_week['risk_high_pct'].mean():.0%}", "High Risk %")
-kpi(col5, int(df_week["total_checkouts"].sum()), "Total Checkouts")
+def fmt(value, spec):
+    return "—" if value is None else format(value, spec)
+
+def render_summary(summary):
+    col1, col2, col3, col4, col5 = st.columns(5)
+    kpi(col1, fmt(summary.participation_rate, ".0%"), "Participation")
+    kpi(col2, fmt(summary.avg_stress, ".1f") + "/10", "Avg Stress")
+    kpi(col3, fmt(summary.avg_sleep, ".1f") + "h", "Avg Sleep")
+    kpi(col4, fmt(summary.high_risk_pct, ".0%"), "High Risk %")
+    kpi(col5, summary.total_checkouts, "Total Checkouts")
+
+    st.subheader("⚠️ Alerts & Insights")
+    for alert in summary.alerts:
+        st.markdown(ALERT_BOXES[alert], unsafe_allow_html=True)
+
+summary_area = st.container()
+requests_in_flight = client.prefetch_dashboard(
+    start_date, end_date, st.session_state.get("departments")
+)
+summary = result_or(requests_in_flight.summary, None)
+
+if summary is not None:
+    with summary_area:
+        render_summary(summary)
 
 # ============================================================
-# ALERTS
+# LOAD DATA
 # ============================================================
 
-st.subheader("⚠️ Alerts & Insights")
+df = result_or(requests_in_flight.departments, pd.DataFrame())
 
-if df_week["avg_stress"].mean() > 7.5:
-    st.markdown("""
-    <div class="alert-box">
-        🚨 <strong>Elevated Stress Detected</strong><br>
-        Organization-wide stress levels are critically high.
-    </div>
-    """, unsafe_allow_html=True)
+if df.empty:
+    st.warning("📊 No live data available — showing demo data.")
+    df = generate_fallback_data()
 
-if df_week["avg_sleep"].mean() < 6.5:
-    st.markdown("""
-    <div class="alert-box">
-        😴 <strong>Sleep Deficit Warning</strong><br>
-        Average sleep below healthy range.
-    </div>
-    """, unsafe_allow_html=True)
+df["date"] = pd.to_datetime(df["date"])
+
+# ============================================================
+# DEPARTMENT FILTER
+# ============================================================
+
+selected_depts = st.sidebar.multiselect(
+    "Departments",
+    options=sorted(df["department"].unique()),
+    default=sorted(df["department"].unique()),
+    key="departments"
+)
+
+df = df[df["department"].isin(selected_depts)]
+
+if summary is None:
+    with summary_area:
+        render_summary(summarize_locally(df))
 
 # ============================================================
 # DEPARTMENT COMPARISON
@@ -274,6 +317,34 @@ with col2:
     fig.update_layout(barmode="stack", template="plotly_dark", title="Risk Distribution")
     st.plotly_chart(fig, use_container_width=True)
 
+# ============================================================
+# STRESS TAIL (MEDIAN & P90 FROM MERGED SKETCHES)
+# ============================================================
+
+st.subheader("🎯 Stress Distribution by Department")
+
+try:
+    quantiles = client.department_quantiles(start_date, end_date, selected_depts)
+except requests.RequestException:
+    quantiles = None
+
+if quantiles and quantiles["departments"]:
+    tail = pd.DataFrame([
+        {
+            "department": dept,
+            "median": fields["self_reported_stress"]["p50"],
+            "p90": fields["self_reported_stress"]["p90"],
+        }
+        for dept, fields in quantiles["departments"].items()
+    ]).sort_values("p90")
+    fig = go.Figure()
+    fig.add_bar(name="Median", x=tail["department"], y=tail["median"])
+    fig.add_bar(name="P90", x=tail["department"], y=tail["p90"])
+    fig.update_layout(barmode="group", template="plotly_dark", yaxis=dict(range=[0, 10]))
+    st.plotly_chart(fig, use_container_width=True)
+else:
+    st.caption("Stress percentiles are only available from live data.")
+
 # ============================================================
 # TRENDS
 # ============================================================
@@ -300,13 +371,19 @@ with col2:
 
 st.subheader("💼 Workload vs Sleep")
 
+bin_count = st.slider("Bins per axis", 5, 50, 20)
+bins_df = load_workload_bins(start_date, end_date, bin_count, selected_depts)
+
+if bins_df.empty:
+    bins_df = bin_locally(df, bin_count)
+
 fig = px.scatter(
-    df,
+    bins_df,
     x="avg_workload",
     y="avg_sleep",
     color="avg_stress",
     size="total_checkouts",
-    hover_data=["department"],
+    hover_data=["rows"],
     color_continuous_scale="RdYlGn_r"
 )
 fig.update_layout(template="plotly_dark")